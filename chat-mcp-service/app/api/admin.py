@@ -312,7 +312,7 @@ def get_mcp_config() -> MCPConfigResponse:
 
 
 @router.post("/mcp-config", response_model=Dict[str, Any])
-def update_mcp_config(request: MCPConfigUpdateRequest) -> Dict[str, Any]:
+async def update_mcp_config(request: MCPConfigUpdateRequest) -> Dict[str, Any]:
     """Update MCP configuration."""
     try:
         # Validate JSON structure - support both old format (mcpServers) and new format (servers)
@@ -361,25 +361,18 @@ def update_mcp_config(request: MCPConfigUpdateRequest) -> Dict[str, Any]:
         
         # Reload MCP manager (gracefully closes old connections, reinitializes everything)
         from ..core.container import get_container
-        import asyncio
         try:
             container = get_container()
             chat_service = container.chat_service
             mcp_manager = chat_service.mcp_registry
             
-            # Close existing connections and reload
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
-            # Close old connections and reload
-            loop.run_until_complete(mcp_manager.close())
+            # Close old connections and reload on the application's event loop,
+            # which also owns the MCP client sessions used by chat requests
+            await mcp_manager.close()
             
             # Update config path and reload
             mcp_manager.config_path = str(config_path)
-            loop.run_until_complete(mcp_manager.load())
+            await mcp_manager.load()
             
             # Get updated server info
             server_info = [
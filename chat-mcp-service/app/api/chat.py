@@ -1,18 +1,26 @@
 """Chatbot API routes."""
 from __future__ import annotations
 
-import json
-
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 
 from ..llm import LLMError
 from ..models import ChatRequest, GenerateTitleRequest, GenerateTitleResponse
+from ..utils import fast_json
 from ..utils.exceptions import format_error_message
 from .dependencies import get_chat_service
 
 router = APIRouter()
 
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = _SSE_PREFIX + fast_json.dumps_bytes({"type": "done"}) + _SSE_SUFFIX
+
+
+def _sse_event(event: dict) -> bytes:
+    """Encode an event as an SSE data line."""
+    return _SSE_PREFIX + fast_json.dumps_bytes(event) + _SSE_SUFFIX
+
 
 @router.post("/agent/message/stream")
 async def agent_message_stream(
@@ -27,21 +35,18 @@ async def agent_message_stream(
             # Use async generator directly - no threads needed!
             # This provides true async concurrency with minimal overhead
             async for event in chat_service.chat_stream(request):
-                # Format as SSE
-                data = json.dumps(event, ensure_ascii=False)
-                yield f"data: {data}\n\n"
+                # Format as SSE, encoded straight to bytes
+                yield _sse_event(event)
             
             # Send done signal
-            yield "data: " + json.dumps({"type": "done"}, ensure_ascii=False) + "\n\n"
+            yield _SSE_DONE
             
         except LLMError as exc:
             error_msg = format_error_message(exc, "Error processing request")
-            error_data = json.dumps({"type": "error", "content": error_msg}, ensure_ascii=False)
-            yield f"data: {error_data}\n\n"
+            yield _sse_event({"type": "error", "content": error_msg})
         except Exception as exc:
             error_msg = format_error_message(exc, "An error occurred while processing your request")
-            error_data = json.dumps({"type": "error", "content": error_msg}, ensure_ascii=False)
-            yield f"data: {error_data}\n\n"
+            yield _sse_event({"type": "error", "content": error_msg})
     
     return StreamingResponse(
         generate(),
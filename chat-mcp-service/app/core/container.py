@@ -109,6 +109,13 @@ class Container:
             except Exception as e:
                 logger.error(f"Error closing MCP connections: {e}", exc_info=True)
         
+        if self._llm_client:
+            try:
+                await self._llm_client.close()
+                logger.info("LLM client closed")
+            except Exception as e:
+                logger.error(f"Error closing LLM client: {e}", exc_info=True)
+        
         self._initialized = False
         logger.info("Container shutdown complete")
 
@@ -1,11 +1,10 @@
 """Unified LLM client for both completion and chat tasks."""
 from __future__ import annotations
 
-import json
 import logging
-import time
 from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
+from ..config import get_config
 from .factory import LLMClientFactory
 from .provider import LLMError
 
@@ -21,10 +20,23 @@ class LLMClient:
         self._config = self._client._config
     
     def _get_client(self):
-        """Get provider client, recreating it if needed to use latest config."""
-        # Always get a fresh client to ensure we use the latest config
-        # This allows config updates to take effect without restarting the server
-        return LLMClientFactory.get_default_client()
+        """
+        Get provider client, recreating it only when the config has been reloaded.
+        
+        The provider client owns the pooled HTTP connection, so reusing it avoids
+        a new TCP/TLS handshake per request. Config updates go through
+        reload_config(), which swaps the global config instance; comparing by
+        identity lets updates take effect without restarting the server.
+        """
+        if self._client._config is not get_config():
+            logger.info("LLM configuration reloaded, recreating provider client")
+            self._client = LLMClientFactory.get_default_client()
+            self._config = self._client._config
+        return self._client
+
+    async def close(self):
+        """Close the cached provider client and its connection pool."""
+        await self._client.close()
 
     @property
     def has_api_key(self) -> bool:
@@ -97,62 +109,16 @@ class LLMClient:
                 payload["functions"] = functions
                 payload["function_call"] = "auto"  # Let model decide when to call functions
             
-            # Track tool calls across chunks
-            current_tool_calls = {}  # id -> {id, name, arguments}
-            
-            # For now, use a simplified approach:
-            # Collect all chunks and check for tool calls at the end
-            # In a production system, we'd parse tool calls from the stream in real-time
-            accumulated_content = ""
-            all_chunks = []
-            
-            # Make streaming request
+            # Chunks are passed straight through; nothing here needs the full text,
+            # so it isn't accumulated
             async for chunk in client._make_stream_request("chat/completions", payload):
-                accumulated_content += chunk
-                all_chunks.append(chunk)
                 yield (chunk, None)
-            
-            # After streaming, check if we need to make a non-streaming call to detect tool calls
-            # This is a simplified approach - in production, tool calls would be detected in the stream
-            # For now, we'll let the chat service handle tool calling logic differently
                     
         except LLMError as exc:
             raise
         except Exception as exc:
             raise LLMError(str(exc)) from exc
 
-    def _extract_content_and_tool_calls(self, chunk_data: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
-        """
-        Extract content and tool call updates from stream chunk.
-        
-        Returns:
-            Tuple of (content, list of tool_call_updates)
-        """
-        if "choices" not in chunk_data or not chunk_data["choices"]:
-            return ("", [])
-        
-        delta = chunk_data["choices"][0].get("delta", {})
-        content = delta.get("content", "")
-        
-        tool_calls = []
-        if "function_call" in delta:
-            func_call = delta["function_call"]
-            tool_call_update = {}
-            if "name" in func_call:
-                tool_call_update["name"] = func_call["name"]
-            if "arguments" in func_call:
-                tool_call_update["arguments"] = func_call["arguments"]
-            if "id" in func_call:
-                tool_call_update["id"] = func_call["id"]
-            elif "index" in func_call:
-                # Some providers use index instead of id
-                tool_call_update["id"] = str(func_call["index"])
-            
-            if tool_call_update:
-                tool_calls.append(tool_call_update)
-        
-        return (content, tool_calls)
-
     def _heuristic_chat(self, messages: List[Dict[str, str]]) -> str:
         """Fallback response when API key is not available."""
         if not messages:
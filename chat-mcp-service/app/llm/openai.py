@@ -17,6 +17,48 @@ from .base import BaseLLMClient, LLMError
 
 logger = logging.getLogger(__name__)
 
+# One connection pool for the whole process. Provider clients are recreated when
+# the config is reloaded; sharing the pool keeps warm (HTTP/2) connections alive
+# across those swaps instead of opening new TCP/TLS sessions.
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_http_client(read_timeout: float) -> httpx.AsyncClient:
+    """Get or lazily create the process-wide httpx.AsyncClient."""
+    global _shared_http_client
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        # Configure timeout
+        timeout = httpx.Timeout(
+            connect=30.0,
+            read=read_timeout,
+            write=30.0,
+            pool=30.0
+        )
+        
+        # Configure connection pool limits for better performance
+        # max_connections: maximum number of connections in the pool
+        # max_keepalive_connections: connections to keep alive for reuse
+        limits = httpx.Limits(
+            max_connections=100,  # Maximum connections in pool
+            max_keepalive_connections=50  # Keep plenty of warm connections for reuse
+        )
+        
+        _shared_http_client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=limits,
+            http2=True,  # Enable HTTP/2 for better performance
+            follow_redirects=True,
+        )
+    return _shared_http_client
+
+
+async def close_shared_http_client() -> None:
+    """Close the process-wide httpx.AsyncClient (on application shutdown)."""
+    global _shared_http_client
+    if _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
+
 
 class OpenAIClient(BaseLLMClient):
     """OpenAI LLM client for OpenAI API or OpenAI-compatible proxy servers."""
@@ -25,40 +67,15 @@ class OpenAIClient(BaseLLMClient):
         """Initialize OpenAI client with AsyncOpenAI SDK."""
         super().__init__(api_key, config)
         self._openai_client: Optional[AsyncOpenAI] = None
-        self._http_client: Optional[httpx.AsyncClient] = None
 
     def _get_http_client(self) -> httpx.AsyncClient:
         """
-        Get or create shared httpx.AsyncClient with connection pooling.
+        Get the shared httpx.AsyncClient with connection pooling.
         
         This enables connection reuse and improves performance for multiple requests.
+        Per-request timeouts are still set from config by the AsyncOpenAI client.
         """
-        if self._http_client is None:
-            # Configure timeout
-            timeout = httpx.Timeout(
-                connect=30.0,
-                read=self._config.llm_timeout,
-                write=30.0,
-                pool=30.0
-            )
-            
-            # Configure connection pool limits for better performance
-            # max_connections: maximum number of connections in the pool
-            # max_keepalive_connections: connections to keep alive for reuse
-            # Increased keepalive connections to reduce connection establishment overhead
-            limits = httpx.Limits(
-                max_connections=100,  # Maximum connections in pool
-                max_keepalive_connections=50  # Increased from 20 to 50 for better connection reuse
-            )
-            
-            self._http_client = httpx.AsyncClient(
-                timeout=timeout,
-                limits=limits,
-                http2=True,  # Enable HTTP/2 for better performance
-                # Enable connection pooling optimizations
-                follow_redirects=True,
-            )
-        return self._http_client
+        return get_shared_http_client(self._config.llm_timeout)
 
     def _get_openai_client(self) -> AsyncOpenAI:
         """
@@ -90,26 +107,26 @@ class OpenAIClient(BaseLLMClient):
         This helps reduce TTFB (Time To First Byte) for the first real request.
         """
         try:
-            client = self._get_openai_client()
-            # Make a minimal request to establish connection
-            # Use a very small model or a health check endpoint if available
-            # For now, we'll just ensure the HTTP client is ready
+            self._get_openai_client()
             http_client = self._get_http_client()
-            # The connection will be established on first real request
-            # But having the client ready helps
+            # A cheap GET on the models endpoint opens the TCP/TLS (and HTTP/2)
+            # connection, which then stays in the keep-alive pool for the first
+            # real request. The response status is irrelevant.
+            await http_client.get(
+                f"{self._get_base_url()}/models",
+                headers={"Authorization": f"Bearer {self.api_key or 'not-set'}"},
+                timeout=5.0,
+            )
             logger.debug("Connection pool warmed up")
         except Exception as e:
-            logger.debug(f"Connection warmup skipped: {e}")
+            logger.debug("Connection warmup skipped: %s", e)
 
     async def close(self):
-        """Close OpenAI client and HTTP client, release resources."""
+        """Close OpenAI client and the shared HTTP client, release resources."""
         await super().close()
-        if self._openai_client is not None:
-            await self._openai_client.close()
-            self._openai_client = None
-        if self._http_client is not None:
-            await self._http_client.aclose()
-            self._http_client = None
+        # AsyncOpenAI.close() would only close the injected shared client as well
+        self._openai_client = None
+        await close_shared_http_client()
 
     def _get_api_key(self) -> Optional[str]:
         """Get API key from environment variable."""
@@ -188,34 +205,42 @@ class OpenAIClient(BaseLLMClient):
         
         Note: endpoint parameter is kept for interface compatibility but not used,
         as SDK already knows to call chat.completions.create().
+        
+        The payload is sent as-is without copying; a legacy 'functions' payload
+        is converted to 'tools' in place, so callers must not reuse it afterwards
+        expecting the legacy keys.
         """
-        model = payload.get("model", self._get_model_name())
+        # Only fall back to the config lookup when the payload has no model
+        # (a .get() default would be evaluated on every request)
+        model = payload.get("model") or self._get_model_name()
         
-        # Convert functions to tools format
-        request_params = self._convert_functions_to_tools(payload.copy())
-        request_params["stream"] = True
+        # Convert functions to tools format (no-op when tools are already used)
+        request_params = self._convert_functions_to_tools(payload)
+        if not request_params.get("stream"):
+            request_params["stream"] = True
 
-        logger.info(f"OpenAI streaming request (async) - Model: {model}")
-        if "tools" in request_params:
-            logger.debug(f"Using {len(request_params['tools'])} tools (converted from functions)")
+        logger.info("OpenAI streaming request (async) - Model: %s", model)
+        if "tools" in request_params and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Using %d tools", len(request_params["tools"]))
 
         try:
             # Get client early to ensure connection pool is ready
+            # (it is bound to the shared, already pooled HTTP client)
             client = self._get_openai_client()
             
-            # Pre-warm connection by ensuring HTTP client is initialized
-            # This helps reduce first request latency
-            http_client = self._get_http_client()
-            
             # Use SDK's streaming method - returns chunk objects directly
             # The connection pool will reuse existing connections if available
             stream = await client.chat.completions.create(**request_params)
             
             # Yield the full chunk objects so caller can access tool_calls, content, etc.
-            async for chunk in stream:
-                yield chunk
+            try:
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                # Release the HTTP response back to the pool if the caller stops early
+                await stream.close()
                 
         except Exception as exc:
-            logger.error(f"OpenAI streaming error: {str(exc)}", exc_info=True)
+            logger.error("OpenAI streaming error: %s", exc, exc_info=True)
             error_msg = str(exc)
             raise LLMError(f"OpenAI streaming error：{error_msg}") from exc
\ No newline at end of file
@@ -6,6 +6,8 @@ import json
 import logging
 from typing import Any, Dict, List, Optional
 
+from ..utils import fast_json
+
 try:
     from mcp import ClientSession, StdioServerParameters
     from mcp.client.stdio import stdio_client
@@ -360,9 +362,13 @@ class MCPClient:
                 if result.content and len(result.content) > 0:
                     # Get text from first content item
                     text = result.content[0].text if hasattr(result.content[0], 'text') else str(result.content[0])
-                    # Try to parse as JSON, otherwise return as plain text string
+                    # Only JSON objects are returned parsed; anything else (plain text,
+                    # arrays, scalars) is passed through as the original string, so
+                    # don't spend a parse on text that can't be an object
+                    if not text.lstrip().startswith("{"):
+                        return text
                     try:
-                        parsed = json.loads(text)
+                        parsed = fast_json.loads(text)
                         # If parsed successfully and it's a dict, return it
                         if isinstance(parsed, dict):
                             return parsed
@@ -45,6 +45,9 @@ class MCPManager:
         self.tool_index: Dict[str, str] = {}  # tool_name -> server_id
         self.server_types: Dict[str, str] = {}  # server_id -> "local" | "external_stdio" | "external_ws"
         self.server_transports: Dict[str, str] = {}  # server_id -> transport type
+        self.version = 0  # 工具集变更计数，用于失效缓存
+        self._function_definitions: Optional[List[Dict[str, Any]]] = None
+        self._function_definitions_version = -1
         
     async def load(self):
         """加载所有工具配置"""
@@ -87,12 +90,18 @@ class MCPManager:
                 logger.error(f"Failed to load server {server_id}: {e}", exc_info=True)
                 continue
         
+        self._bump_version()
         logger.info(
             f"MCP Manager loaded: {len(self.local_tools)} local tools, "
             f"{len(self.external_clients)} external servers, "
             f"{len(self.tool_index)} total tools"
         )
     
+    def _bump_version(self):
+        """标记工具集已变更，使缓存的函数定义和系统提示失效"""
+        self.version += 1
+        self._function_definitions = None
+    
     async def _load_local_tool(self, server_id: str, config: Dict):
         """加载本地工具（直接调用，无 subprocess）"""
         module_path = config.get("module")
@@ -342,11 +351,21 @@ class MCPManager:
         """
         Get function definitions for LLM function calling.
         
+        The list is built once per tool-set version and sorted by name so the
+        request prefix stays byte-identical between requests. Callers must not
+        mutate the returned list.
+        
         Returns:
             List of function definitions in OpenAI format
         """
+        if (
+            self._function_definitions is not None
+            and self._function_definitions_version == self.version
+        ):
+            return self._function_definitions
+        
         functions = []
-        for tool in self.list_tools():
+        for tool in sorted(self.list_tools(), key=lambda t: t.get("name", "")):
             function_def = {
                 "name": tool.get("name", ""),
                 "description": tool.get("description", ""),
@@ -354,7 +373,9 @@ class MCPManager:
             }
             functions.append(function_def)
         
-        logger.info(f"MCP Manager generated {len(functions)} function definitions")
+        self._function_definitions = functions
+        self._function_definitions_version = self.version
+        logger.info("MCP Manager generated %d function definitions", len(functions))
         return functions
     
     async def close(self):
@@ -370,5 +391,6 @@ class MCPManager:
         self.external_clients.clear()
         self.local_tools.clear()
         self.tool_index.clear()
+        self._bump_version()
         logger.info("MCP Manager closed")
 
@@ -1,9 +1,11 @@
 """Chat service for conversational travel agent with MCP tool calling."""
 from __future__ import annotations
 
+import itertools
 import json
 import logging
 import time
+from contextlib import aclosing
 from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 from ..config import get_config
@@ -11,9 +13,16 @@ from ..llm import LLMClient, LLMError
 from ..llm.openai import OpenAIClient
 from ..mcp_tools import MCPManager
 from ..models import ChatRequest
+from ..utils import fast_json
+from ..utils.constants import FALLBACK_STREAM_TIMEOUT
 from ..utils.exceptions import format_error_message
+from ..utils.incremental_json import IncrementalJsonParser, is_balanced_json
+from ..utils.perf import PerfTimer, is_perf_enabled
 from .message_processing import MessageProcessingService
+from .response_cache import ResponseCache
 from .tool_execution import ToolExecutionService
+from .stream_buffer import StreamBuffer
+from .tool_result_store import GET_TOOL_RESULT_FUNCTION, ToolResultStore
 from .tool_result_formatter import (
     check_tools_used_but_no_info,
     format_tool_result_for_llm,
@@ -22,6 +31,9 @@ from .tool_result_formatter import (
 
 logger = logging.getLogger(__name__)
 
+# Fallback ids for providers that omit tool call ids
+_next_call_id = itertools.count(1).__next__
+
 
 class ChatService:
     """Service for conversational travel agent with MCP tool calling."""
@@ -42,6 +54,19 @@ class ChatService:
         self.tool_executor = ToolExecutionService(
             self.mcp_registry, format_tool_result_for_llm
         )
+        self.response_cache = ResponseCache()
+
+        # Request payload minus messages, rebuilt when the provider client
+        # (config reload) or the function list changes
+        self._payload_client = None
+        self._payload_functions: Optional[List[Dict[str, Any]]] = None
+        self._payload_skeleton: Dict[str, Any] = {}
+        self._tool_choice_key: Optional[str] = None
+
+        # Function definitions plus get_tool_result, rebuilt only when the
+        # registry hands out a new definitions list
+        self._reader_functions_source: Optional[List[Dict[str, Any]]] = None
+        self._reader_functions: List[Dict[str, Any]] = []
 
     async def chat_stream(
         self, request: ChatRequest
@@ -57,19 +82,16 @@ class ChatService:
         - {"type": "tool_call_end", "tool": "...", "result": "..."} for tool call end
         - {"type": "tool_call_error", "tool": "...", "error": "..."} for tool call errors
         """
-        chat_start_time = time.time()
+        perf_enabled = is_perf_enabled(logger)
+        chat_start_ns = time.monotonic_ns() if perf_enabled else 0
         try:
             # Prepare messages from request
-            prep_start = time.time()
-            messages = self.message_processor.prepare_messages(request)
-            prep_time = time.time() - prep_start
-            logger.info(f"[PERF] Message preparation took {prep_time:.3f}s")
+            with PerfTimer(logger, "Message preparation"):
+                messages = self.message_processor.prepare_messages(request)
 
             # Build system prompt
-            prompt_start = time.time()
-            system_prompt = self.message_processor.build_agent_system_prompt()
-            prompt_time = time.time() - prompt_start
-            logger.info(f"[PERF] System prompt building took {prompt_time:.3f}s")
+            with PerfTimer(logger, "System prompt building"):
+                system_prompt = self.message_processor.build_agent_system_prompt()
 
             # Handle empty conversation
             if not messages:
@@ -79,176 +101,243 @@ class ChatService:
                 }
                 return
 
-            # Get function definitions for tool calling (async)
-            func_start = time.time()
-            functions = await self.mcp_registry.get_tool_function_definitions()
-            func_time = time.time() - func_start
-            logger.info(
-                f"[PERF] Function definitions loading took {func_time:.3f}s, "
-                f"found {len(functions)} functions"
+            # Get LLM client early to ensure connection pool is ready
+            # This helps reduce latency by having the client and connection pool initialized
+            client = self.llm_client._get_client()
+
+            # Repeated questions that were answered without tools are replayed,
+            # only by the provider/model that produced the answer
+            cache_key = self.response_cache.make_key(
+                system_prompt or "", messages, f"{type(client).__name__}:{client.model}"
             )
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                logger.info("Serving cached response (length: %d)", len(cached_response))
+                yield {"type": "chunk", "content": cached_response}
+                return
+
+            # Get function definitions for tool calling (async)
+            with PerfTimer(logger, "Function definitions loading"):
+                functions = await self.mcp_registry.get_tool_function_definitions()
+            logger.info("Found %d functions", len(functions))
+
+            # The system prompt is fixed for the request, so the conversation sent
+            # to the LLM is built once; tool messages are appended to it in place.
+            all_messages = [{"role": "system", "content": system_prompt or ""}, *messages]
+            # Large tool results of this request only; prepare_messages drops tool
+            # messages from history, so references never outlive the request
+            result_store = ToolResultStore()
+            # Messages before this index were already shortened by result_store
+            compacted_upto = len(all_messages)
+            # get_tool_result is only offered once something was stored
+            reader_offered = False
+
+            # Prepare payload once: it references all_messages, so tool messages
+            # appended by later iterations are picked up without a rebuild
+            payload, tool_choice_key = self._build_payload(client, all_messages, functions)
 
             # Main chat loop - similar to backend_new agent.py
             iteration = 0
-            accumulated_content = ""
+            # Streamed text is kept as parts and only joined when inspected
+            content_parts: List[str] = []
 
             while iteration < self.max_tool_iterations:
                 iteration += 1
-                iter_start_time = time.time()
+                iter_start_ns = time.monotonic_ns() if perf_enabled else 0
                 logger.info(
-                    f"\n{'='*60}\nIteration {iteration}/{self.max_tool_iterations}\n{'='*60}"
+                    "\n%s\nIteration %d/%d\n%s",
+                    "=" * 60, iteration, self.max_tool_iterations, "=" * 60,
                 )
+                # Coalesces text deltas so the client gets fewer, larger events
+                stream_buffer = StreamBuffer()
 
                 try:
                     # Step 1: Stream LLM response with real-time tool call detection
                     tool_call_detected = False
                     tool_call_data: Optional[Dict[str, Any]] = None
-                    accumulated_text = ""
+                    text_len = 0
 
-                    # Get LLM client early to ensure connection pool is ready
-                    # This helps reduce latency by having the client and connection pool initialized
-                    client = self.llm_client._get_client()
-                    
-                    # Pre-initialize OpenAI client and HTTP client if using OpenAI SDK
-                    # This ensures connection pool is ready before making the request
-                    if isinstance(client, OpenAIClient):
-                        # Ensure HTTP client and OpenAI client are initialized
-                        _ = client._get_http_client()  # Initialize connection pool
-                        _ = client._get_openai_client()  # Initialize OpenAI client
-                    
-                    system_msg = {"role": "system", "content": system_prompt or ""}
-                    all_messages = [system_msg] + messages
-
-                    # Prepare payload
-                    payload = client._normalize_payload(all_messages, model=client.model)
-                    payload["stream"] = True
-
-                    # Add tools if available
-                    if functions:
-                        # Convert functions to tools format for OpenAI-compatible API
-                        if isinstance(client, OpenAIClient):
-                            tools = []
-                            for func in functions:
-                                tools.append({
-                                    "type": "function",
-                                    "function": func
-                                })
-                            payload["tools"] = tools
-                            payload["tool_choice"] = "auto"
-                        else:
-                            # Legacy format for other providers
-                            payload["functions"] = functions
-                            payload["function_call"] = "auto"
+                    if result_store and not reader_offered:
+                        # A result was stored out of the prompt: let the LLM page through it
+                        payload, tool_choice_key = self._build_payload(
+                            client, all_messages, self._with_result_reader(functions)
+                        )
+                        reader_offered = True
+
+                    if tool_choice_key:
+                        # On the last allowed iteration any tool call would be
+                        # executed without a follow-up turn to answer from it, so
+                        # constrain the model to produce the final response.
+                        payload[tool_choice_key] = (
+                            "none" if iteration == self.max_tool_iterations else "auto"
+                        )
 
                     logger.info(
-                        f"Starting stream request with {len(functions)} functions available"
+                        "Starting stream request with %d functions available", len(functions)
                     )
 
                     # Track tool call state - similar to backend_new agent.py
                     current_tool_call: Optional[Dict[str, Any]] = None
                     tool_call_id: Optional[str] = None
                     tool_call_name: Optional[str] = None
-                    tool_call_args_buffer = ""
+                    finish_reason: Optional[str] = None
                     tool_calls_by_id: Dict[str, Dict[str, Any]] = {}
+                    # Stream index -> (call, parser, argument parts); deltas after the
+                    # first carry only the index, so one lookup finds all per-call state
+                    calls_by_index: Dict[
+                        int, Tuple[Dict[str, Any], IncrementalJsonParser, List[str]]
+                    ] = {}
+                    # Per-call argument completeness, updated with each delta only
+                    arg_parsers: Dict[str, IncrementalJsonParser] = {}
+                    # Argument deltas per call, joined once when the stream ends
+                    arg_parts: Dict[str, List[str]] = {}
                     chunk_count = 0
-                    first_chunk_time = None
+
+                    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+                    info_enabled = logger.isEnabledFor(logging.INFO)
+                    skipped_text_chunks = 0
+                    # Bound once: these run for every text delta
+                    buffer_push = stream_buffer.push
+                    append_content = content_parts.append
 
                     # Stream and parse in real-time using SDK directly
-                    request_start = time.time()
+                    request_start_ns = time.monotonic_ns() if perf_enabled else 0
                     chunk_index = 0
                     
                     # Use SDK's streaming method directly (no httpx)
-                    async for chunk in client._make_stream_request("chat/completions", payload):
-                        chunk_index += 1
-                        if first_chunk_time is None:
-                            first_chunk_time = time.time() - request_start
-                            logger.info(
-                                f"[PERF] First chunk received after {first_chunk_time:.3f}s (TTFB)"
-                            )
+                    # aclosing() releases the upstream response even when we stop early
+                    async with aclosing(
+                        client._make_stream_request("chat/completions", payload)
+                    ) as stream, aclosing(stream_buffer.paced(stream)) as paced_stream:
+                        async for chunk in paced_stream:
+                            if chunk is None:
+                                # The upstream paused with text buffered past the flush interval
+                                pending = stream_buffer.flush()
+                                if pending:
+                                    yield {"type": "chunk", "content": pending}
+                                continue
+                            chunk_index += 1
+                            if chunk_index == 1 and perf_enabled:
+                                logger.info(
+                                    "[PERF] First chunk received after %.3fs (TTFB)",
+                                    (time.monotonic_ns() - request_start_ns) / 1e9,
+                                )
 
-                        # Extract content and tool calls from SDK chunk object
-                        # Similar to backend_new agent.py logic
-                        if chunk.choices and len(chunk.choices) > 0:
-                            delta = chunk.choices[0].delta
+                            # Extract content and tool calls from SDK chunk object
+                            # Similar to backend_new agent.py logic
+                            choices = chunk.choices
+                            if choices:
+                                # SDK delta models always define these fields,
+                                # so read them directly once per chunk
+                                choice = choices[0]
+                                delta = choice.delta
+                                tool_call_deltas = delta.tool_calls
                             
-                            # Check for tool_calls (OpenAI format)
-                            if hasattr(delta, 'tool_calls') and delta.tool_calls:
-                                tool_call_detected = True
+                                # Check for tool_calls (OpenAI format)
+                                if tool_call_deltas:
+                                    if not tool_call_detected:
+                                        # Emit any buffered text before the tool call
+                                        pending = stream_buffer.flush()
+                                        if pending:
+                                            yield {"type": "chunk", "content": pending}
+                                    tool_call_detected = True
                                 
-                                for tool_call_delta in delta.tool_calls:
-                                    # Initialize tool call structure
-                                    if current_tool_call is None:
-                                        tool_call_id = getattr(tool_call_delta, 'id', None)
-                                        current_tool_call = {
-                                            "id": tool_call_id or f"call_{iteration}_{chunk_index}",
-                                            "type": "function",
-                                            "function": {"name": "", "arguments": ""}
-                                        }
+                                    for tool_call_delta in tool_call_deltas:
+                                        # Parallel tool calls are interleaved by index
+                                        call_index = getattr(tool_call_delta, 'index', None) or 0
+                                        call_state = calls_by_index.get(call_index)
+                                        if call_state is None:
+                                            # Initialize tool call structure
+                                            tool_call_id = getattr(tool_call_delta, 'id', None)
+                                            call_id = tool_call_id or f"call_{_next_call_id()}"
+                                            # Same dict object, so deltas only need applying once
+                                            new_call = tool_calls_by_id[call_id] = {
+                                                "id": call_id,
+                                                "type": "function",
+                                                "function": {"name": "", "arguments": ""}
+                                            }
+                                            new_parser = arg_parsers[call_id] = IncrementalJsonParser()
+                                            new_parts = arg_parts[call_id] = []
+                                            call_state = (new_call, new_parser, new_parts)
+                                            calls_by_index[call_index] = call_state
+                                        current_tool_call, args_parser, call_arg_parts = call_state
                                     
-                                    # Accumulate tool call information
-                                    func_delta = getattr(tool_call_delta, 'function', None)
-                                    if func_delta:
-                                        func_name = getattr(func_delta, 'name', None)
-                                        if func_name:
-                                            tool_call_name = func_name
-                                            current_tool_call["function"]["name"] = tool_call_name
+                                        # Accumulate tool call information
+                                        func_delta = getattr(tool_call_delta, 'function', None)
+                                        if func_delta:
+                                            func_name = getattr(func_delta, 'name', None)
+                                            if func_name:
+                                                tool_call_name = func_name
+                                                current_tool_call["function"]["name"] = tool_call_name
                                         
-                                        func_args = getattr(func_delta, 'arguments', None)
-                                        if func_args:
-                                            tool_call_args_buffer += func_args
-                                            current_tool_call["function"]["arguments"] += func_args
-                                    
-                                    # Store in tool_calls_by_id for compatibility
-                                    call_id = current_tool_call["id"]
-                                    if call_id not in tool_calls_by_id:
-                                        tool_calls_by_id[call_id] = current_tool_call.copy()
-                                    else:
-                                        # Update existing entry
-                                        existing = tool_calls_by_id[call_id]
-                                        if tool_call_name:
-                                            existing["function"]["name"] = tool_call_name
-                                        if func_args:
-                                            existing["function"]["arguments"] += func_args
+                                            func_args = getattr(func_delta, 'arguments', None)
+                                            if func_args:
+                                                if not isinstance(func_args, str):
+                                                    func_args = str(func_args)
+                                                call_arg_parts.append(func_args)
+                                                args_parser.feed(func_args)
                             
-                            # Check for regular text content
-                            content = getattr(delta, 'content', None)
-                            if content:
-                                if not tool_call_detected:
-                                    # Only yield text if no tool call detected
-                                    accumulated_text += content
-                                    accumulated_content += content
-                                    chunk_count += 1
-                                    yield {"type": "chunk", "content": content}
-                                else:
-                                    # Skip text content when tool call is detected
-                                    logger.debug(
-                                        f"Skipping text content chunk (tool call detected): "
-                                        f"{content[:50]}"
+                                # Check for regular text content
+                                content = delta.content
+                                if content:
+                                    if not tool_call_detected:
+                                        # Only yield text if no tool call detected
+                                        text_len += len(content)
+                                        append_content(content)
+                                        chunk_count += 1
+                                        pending = buffer_push(content)
+                                        if pending:
+                                            yield {"type": "chunk", "content": pending}
+                                    else:
+                                        # Skip text content when tool call is detected
+                                        skipped_text_chunks += 1
+                                        if debug_enabled:
+                                            logger.debug(
+                                                "Skipping text content chunk (tool call detected): %s",
+                                                content[:50],
+                                            )
+
+                                # Log tool call detection
+                                if (
+                                    chunk_index == 1
+                                    and tool_call_detected
+                                    and current_tool_call
+                                    and info_enabled
+                                ):
+                                    name = current_tool_call["function"].get("name", "")
+                                    args = "".join(arg_parts[current_tool_call["id"]])
+                                    logger.info(
+                                        "🔧 Tool call detected in first chunk, stopping text streaming\n"
+                                        "  Tool call: name='%s', args_length=%d, args_preview='%s'",
+                                        name, len(args), args[:100],
                                     )
 
-                            # Log tool call detection
-                            if tool_call_detected and current_tool_call and chunk_index == 1:
-                                logger.info(
-                                    f"🔧 Tool call detected in first chunk, "
-                                    "stopping text streaming"
-                                )
-                                name = current_tool_call["function"].get("name", "")
-                                args = current_tool_call["function"].get("arguments", "")
-                                logger.info(
-                                    f"  Tool call: name='{name}', "
-                                    f"args_length={len(args)}, args_preview='{args[:100]}'"
-                                )
+                                # The response is final once the model reports why it stopped;
+                                # with tool calls only usage/[DONE] frames can follow, so stop
+                                # reading and execute the tools right away.
+                                if choice.finish_reason:
+                                    finish_reason = choice.finish_reason
+                                    if tool_call_detected:
+                                        break
+
+                    pending = stream_buffer.flush()
+                    if pending:
+                        yield {"type": "chunk", "content": pending}
+
+                    for call_id, parts in arg_parts.items():
+                        tool_calls_by_id[call_id]["function"]["arguments"] = "".join(parts)
 
                     # After stream ends, process tool calls (similar to backend_new)
-                    stream_time = time.time() - request_start
-                    logger.info(
-                        f"[PERF] Streaming took {stream_time:.3f}s, "
-                        f"received {chunk_index} chunks, {chunk_count} content chunks, "
-                        f"tool_call_detected: {tool_call_detected}"
-                    )
+                    if perf_enabled:
+                        logger.info(
+                            "[PERF] Streaming took %.3fs, received %d chunks, "
+                            "%d content chunks, %d skipped text chunks, tool_call_detected: %s",
+                            (time.monotonic_ns() - request_start_ns) / 1e9,
+                            chunk_index, chunk_count, skipped_text_chunks, tool_call_detected,
+                        )
                     
                     # Process tool calls after stream ends (similar to backend_new agent.py)
-                    if tool_call_detected and current_tool_call:
+                    if tool_call_detected and len(tool_calls_by_id) == 1:
                         # Validate and parse tool call arguments
                         tool_name = tool_call_name or current_tool_call["function"].get("name", "")
                         
@@ -262,9 +351,10 @@ class ChatService:
                             continue
                         
                         # Validate arguments JSON
+                        tool_call_args_buffer = current_tool_call["function"]["arguments"]
                         if not tool_call_args_buffer:
                             args = {}
-                            logger.info(f"🔧 Tool call detected: {tool_name} (no arguments)")
+                            logger.info("🔧 Tool call detected: %s (no arguments)", tool_name)
                             tool_call_data = {
                                 "id": current_tool_call["id"],
                                 "name": tool_name,
@@ -273,8 +363,15 @@ class ChatService:
                             }
                         else:
                             try:
-                                args = json.loads(tool_call_args_buffer)
-                                logger.info(f"🔧 Tool call detected: {tool_name} with valid args: {args}")
+                                # Only parse once the streamed JSON is known to be balanced
+                                if not arg_parsers[current_tool_call["id"]].complete:
+                                    raise json.JSONDecodeError(
+                                        "Incomplete JSON arguments",
+                                        tool_call_args_buffer,
+                                        len(tool_call_args_buffer),
+                                    )
+                                args = fast_json.loads(tool_call_args_buffer)
+                                logger.info("🔧 Tool call detected: %s with valid args: %s", tool_name, args)
                                 tool_call_data = {
                                     "id": current_tool_call["id"],
                                     "name": tool_name,
@@ -283,8 +380,8 @@ class ChatService:
                                 }
                             except json.JSONDecodeError as e:
                                 logger.error(
-                                    f"❌ Failed to parse tool call arguments for '{tool_name}': "
-                                    f"'{tool_call_args_buffer[:200]}'. Error: {e}"
+                                    "❌ Failed to parse tool call arguments for '%s': '%s'. Error: %s",
+                                    tool_name, tool_call_args_buffer[:200], e,
                                 )
                                 yield {
                                     "type": "tool_call_error",
@@ -301,43 +398,52 @@ class ChatService:
                                     "type": "function",
                                     "function": {
                                         "name": tool_call_data["name"],
-                                        "arguments": json.dumps(tool_call_data["args"], ensure_ascii=False)
+                                        # Canonical (sorted-key) encoding keeps the replayed
+                                        # history byte-stable for provider prefix caching
+                                        "arguments": fast_json.dumps(
+                                            tool_call_data["args"], sort_keys=True
+                                        ),
                                     }
-                                }]
+                                }],
+                                # Handed to the executor so the arguments are not parsed again
+                                "parsed_args": {tool_call_data["id"]: tool_call_data["args"]},
                             }
 
-                    # If we detected tool calls but didn't complete them, try to get complete ones now
+                    # Parallel tool calls, or a single call that could not be used:
+                    # keep every call whose arguments are complete
                     if tool_call_detected and tool_calls_by_id and not tool_call_data:
                         # Log current state of tool calls
                         logger.info(
-                            f"Stream ended with tool calls detected but not complete. "
-                            f"Checking {len(tool_calls_by_id)} tool call(s)..."
+                            "Stream ended with tool calls detected. "
+                            "Checking %d tool call(s)...",
+                            len(tool_calls_by_id),
                         )
                         for call_id, call_data in tool_calls_by_id.items():
                             func_info = call_data.get("function", {})
                             name = func_info.get("name", "")
                             args = func_info.get("arguments", "")
-                            logger.info(
-                                f"  Tool call '{call_id}': name='{name}', "
-                                f"args_length={len(args)}, args='{args[:200]}'"
-                            )
-                            # Try to parse arguments to check if valid
+                            if info_enabled:
+                                logger.info(
+                                    "  Tool call '%s': name='%s', args_length=%d, args='%s'",
+                                    call_id, name, len(args), args[:200],
+                                )
+                            # Report argument completeness tracked while streaming
                             if args:
-                                try:
-                                    json.loads(args)
-                                    logger.info(f"    ✅ Arguments are valid JSON")
-                                except json.JSONDecodeError as e:
+                                if not arg_parsers[call_id].complete:
                                     logger.warning(
-                                        f"    ❌ Arguments are NOT valid JSON: {str(e)[:100]}"
+                                        "    ❌ Arguments of tool call '%s' are NOT complete JSON",
+                                        call_id,
                                     )
+                                elif info_enabled:
+                                    logger.info("    ✅ Arguments are complete JSON")
                         
                         complete_tool_calls = self._get_complete_tool_calls(
-                            tool_calls_by_id
+                            tool_calls_by_id, arg_parsers
                         )
                         if complete_tool_calls:
                             logger.info(
-                                f"✅ Found {len(complete_tool_calls)} complete tool calls "
-                                "after stream ended"
+                                "✅ Found %d complete tool calls after stream ended",
+                                len(complete_tool_calls),
                             )
                             tool_call_data = {"tool_calls": complete_tool_calls}
                         else:
@@ -365,15 +471,17 @@ class ChatService:
                                         existing_args = merged_calls[name].get("function", {}).get("arguments", "")
                                         merged_calls[name]["function"]["arguments"] = existing_args + args
                                         logger.debug(
-                                            f"Merged tool call '{name}': combined arguments "
-                                            f"(existing={len(existing_args)}, added={len(args)})"
+                                            "Merged tool call '%s': combined arguments "
+                                            "(existing=%d, added=%d)",
+                                            name, len(existing_args), len(args),
                                         )
                             
                             if merged_calls:
                                 incomplete_calls = list(merged_calls.values())
                                 logger.info(
-                                    f"Using {len(incomplete_calls)} incomplete tool call(s) "
-                                    "(merged from multiple entries, will attempt execution, errors will be handled)"
+                                    "Using %d incomplete tool call(s) "
+                                    "(merged from multiple entries, will attempt execution, errors will be handled)",
+                                    len(incomplete_calls),
                                 )
                                 tool_call_data = {"tool_calls": incomplete_calls}
 
@@ -382,29 +490,37 @@ class ChatService:
                         # Execute tool calls
                         tool_calls = tool_call_data["tool_calls"]
                         logger.info(
-                            f"Iteration {iteration}: Executing {len(tool_calls)} tool calls"
+                            "Iteration %d: Executing %d tool calls", iteration, len(tool_calls)
                         )
 
+                        # Results of earlier iterations are re-sent from now on, so
+                        # the large ones become previews; the results about to be
+                        # added stay whole for the turn that answers from them
+                        result_store.compact_messages(all_messages, compacted_upto)
+                        compacted_upto = len(all_messages)
+
                         async for event in self.tool_executor.execute_tool_calls(
-                            tool_calls, "", messages
+                            tool_calls, "", all_messages, result_store,
+                            tool_call_data.get("parsed_args"),
                         ):
                             yield event
 
                         # Continue to next iteration to get LLM's response
                         continue
 
-                    elif accumulated_text:
+                    elif text_len:
                         # Normal text response - we're done
-                        logger.info(
-                            f"✅ Normal response (length: {len(accumulated_text)})"
-                        )
+                        logger.info("✅ Normal response (length: %d)", text_len)
+                        if iteration == 1 and finish_reason == "stop":
+                            # Answered without tools and not cut off, so safe to replay later
+                            self.response_cache.put(cache_key, "".join(content_parts))
                         # Check if tools were used but didn't find useful information
                         if iteration > 1:
                             tools_used_but_no_info = check_tools_used_but_no_info(
-                                messages
+                                all_messages
                             )
                             if tools_used_but_no_info and not response_suggests_contact_harry(
-                                accumulated_content
+                                "".join(content_parts)
                             ):
                                 yield {
                                     "type": "chunk",
@@ -415,39 +531,54 @@ class ChatService:
                     else:
                         # No tool call and no text - might indicate a problem
                         logger.warning(
-                            f"Iteration {iteration}: No tool call and no text content received"
+                            "Iteration %d: No tool call and no text content received", iteration
                         )
-                        if iteration == 1:
-                            # Try fallback: stream without tools
+                        if iteration == 1 and functions:
+                            # Try fallback: stream without tools (retrying is only
+                            # meaningful when the first request actually sent tools)
                             logger.info(
-                                f"Iteration {iteration}: Attempting fallback streaming "
-                                "without tool detection"
+                                "Iteration %d: Attempting fallback streaming without tool detection",
+                                iteration,
                             )
                             try:
+                                # _normalize_payload never adds tools/functions
                                 payload_no_tools = client._normalize_payload(
                                     all_messages, model=client.model
                                 )
                                 payload_no_tools["stream"] = True
-                                if "tools" in payload_no_tools:
-                                    del payload_no_tools["tools"]
-                                if "functions" in payload_no_tools:
-                                    del payload_no_tools["functions"]
+                                # The retry already follows one full round-trip, so
+                                # bound it instead of waiting the whole llm_timeout again
+                                payload_no_tools["timeout"] = min(
+                                    FALLBACK_STREAM_TIMEOUT, client._config.llm_timeout
+                                )
 
                                 chunk_count = 0
                                 # Use SDK streaming directly for fallback
-                                async for chunk in client._make_stream_request("chat/completions", payload_no_tools):
-                                    if chunk.choices and len(chunk.choices) > 0:
-                                        delta = chunk.choices[0].delta
-                                        content = getattr(delta, 'content', None)
-                                        if content:
-                                            accumulated_text += content
-                                            accumulated_content += content
-                                            chunk_count += 1
-                                            yield {"type": "chunk", "content": content}
+                                async with aclosing(
+                                    client._make_stream_request("chat/completions", payload_no_tools)
+                                ) as stream, aclosing(stream_buffer.paced(stream)) as paced_stream:
+                                    async for chunk in paced_stream:
+                                        if chunk is None:
+                                            pending = stream_buffer.flush()
+                                            if pending:
+                                                yield {"type": "chunk", "content": pending}
+                                        elif chunk.choices:
+                                            delta = chunk.choices[0].delta
+                                            content = getattr(delta, 'content', None)
+                                            if content:
+                                                text_len += len(content)
+                                                content_parts.append(content)
+                                                chunk_count += 1
+                                                pending = stream_buffer.push(content)
+                                                if pending:
+                                                    yield {"type": "chunk", "content": pending}
+                                pending = stream_buffer.flush()
+                                if pending:
+                                    yield {"type": "chunk", "content": pending}
 
                                 if chunk_count > 0:
                                     logger.info(
-                                        f"Fallback streaming succeeded: received {chunk_count} chunks"
+                                        "Fallback streaming succeeded: received %d chunks", chunk_count
                                     )
                                     break
                                 else:
@@ -472,7 +603,7 @@ class ChatService:
                         else:
                             # Stop to avoid infinite loop
                             logger.error(
-                                f"Iteration {iteration}: No content received, stopping"
+                                "Iteration %d: No content received, stopping", iteration
                             )
                             yield {
                                 "type": "chunk",
@@ -480,10 +611,16 @@ class ChatService:
                             }
                             break
 
-                    iter_time = time.time() - iter_start_time
-                    logger.info(f"[PERF] Iteration {iteration} total time: {iter_time:.3f}s")
+                    if perf_enabled:
+                        logger.info(
+                            "[PERF] Iteration %d total time: %.3fs",
+                            iteration, (time.monotonic_ns() - iter_start_ns) / 1e9,
+                        )
 
                 except LLMError as exc:
+                    pending = stream_buffer.flush()
+                    if pending:
+                        yield {"type": "chunk", "content": pending}
                     error_msg = format_error_message(exc, "Error processing request")
                     yield {"type": "chunk", "content": error_msg}
                     break
@@ -491,6 +628,9 @@ class ChatService:
                     logger.error(
                         f"Unexpected error during LLM streaming: {exc}", exc_info=True
                     )
+                    pending = stream_buffer.flush()
+                    if pending:
+                        yield {"type": "chunk", "content": pending}
                     yield {
                         "type": "chunk",
                         "content": f"An unexpected error occurred: {str(exc)}",
@@ -502,32 +642,97 @@ class ChatService:
                     f"Reached maximum tool calling iterations ({self.max_tool_iterations})"
                 )
 
-            total_time = time.time() - chat_start_time
-            logger.info(
-                f"[PERF] Total chat_stream took {total_time:.3f}s, "
-                f"completed {iteration} iterations"
-            )
+            if perf_enabled:
+                logger.info(
+                    "[PERF] Total chat_stream took %.3fs, completed %d iterations",
+                    (time.monotonic_ns() - chat_start_ns) / 1e9, iteration,
+                )
 
         except Exception as exc:
-            total_time = time.time() - chat_start_time
-            logger.error(
-                f"[PERF] chat_stream failed after {total_time:.3f}s: {exc}", exc_info=True
-            )
+            if perf_enabled:
+                logger.error(
+                    "[PERF] chat_stream failed after %.3fs: %s",
+                    (time.monotonic_ns() - chat_start_ns) / 1e9, exc, exc_info=True,
+                )
+            else:
+                logger.error("chat_stream failed: %s", exc, exc_info=True)
             yield {
                 "type": "chunk",
                 "content": f"An error occurred while processing your request: {str(exc)}",
             }
 
 
+    def _with_result_reader(self, functions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Return the functions plus get_tool_result, for requests that stored a result.
+
+        The registry returns the same list object until its tool set changes, so
+        the extended list is only rebuilt then. Callers must not mutate it.
+        """
+        if functions is not self._reader_functions_source:
+            self._reader_functions = [*functions, GET_TOOL_RESULT_FUNCTION]
+            self._reader_functions_source = functions
+        return self._reader_functions
+
+    def _build_payload(
+        self, client, messages: List[Dict[str, Any]], functions: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Build the streaming request payload; returns it with its tool-choice key.
+
+        Everything except the messages (model, stream flag, tools) only changes
+        with the provider client or the function list, so that part is built
+        once as a skeleton and each request copies it with its own messages.
+        """
+        if client is not self._payload_client or functions is not self._payload_functions:
+            if isinstance(client, OpenAIClient):
+                # Ensure HTTP client and OpenAI client are initialized
+                client._get_http_client()  # Initialize connection pool
+                client._get_openai_client()  # Initialize OpenAI client
+                build_skeleton = self._build_openai_skeleton
+            else:
+                build_skeleton = self._build_legacy_skeleton
+            self._payload_skeleton, self._tool_choice_key = build_skeleton(client, functions)
+            self._payload_client = client
+            self._payload_functions = functions
+        return {**self._payload_skeleton, "messages": messages}, self._tool_choice_key
+
+    @staticmethod
+    def _build_openai_skeleton(
+        client, functions: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Build the payload skeleton with tools in OpenAI format."""
+        skeleton = client._normalize_payload([], model=client.model)
+        skeleton["stream"] = True
+        if not functions:
+            return skeleton, None
+        skeleton["tools"] = [{"type": "function", "function": func} for func in functions]
+        return skeleton, "tool_choice"
+
+    @staticmethod
+    def _build_legacy_skeleton(
+        client, functions: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Build the payload skeleton with legacy functions."""
+        skeleton = client._normalize_payload([], model=client.model)
+        skeleton["stream"] = True
+        if not functions:
+            return skeleton, None
+        skeleton["functions"] = functions
+        return skeleton, "function_call"
+
     def _get_complete_tool_calls(
-        self, tool_calls_by_id: Dict[str, Dict[str, Any]]
+        self,
+        tool_calls_by_id: Dict[str, Dict[str, Any]],
+        arg_parsers: Dict[str, IncrementalJsonParser],
     ) -> List[Dict[str, Any]]:
         """
         Get complete tool calls (those with both name and valid JSON arguments).
         
         IMPORTANT: We validate that arguments are valid JSON before considering
         a tool call complete. This prevents parsing errors when arguments are
-        still being streamed and incomplete.
+        still being streamed and incomplete. The incremental parser state is
+        checked first, so the full parse only runs on balanced arguments.
         """
         complete_calls = []
         for call_id, call_data in tool_calls_by_id.items():
@@ -542,15 +747,23 @@ class ChatService:
             # Validate arguments: must be valid JSON (or empty string for providers that don't use args)
             if arguments:
                 try:
-                    # Try to parse as JSON to ensure it's complete
-                    json.loads(arguments)
+                    parser = arg_parsers.get(call_id)
+                    balanced = (
+                        parser.complete if parser is not None else is_balanced_json(arguments)
+                    )
+                    if not balanced:
+                        raise json.JSONDecodeError(
+                            "Incomplete JSON arguments", arguments, len(arguments)
+                        )
+                    # Parse as JSON to catch balanced but malformed arguments
+                    fast_json.loads(arguments)
                     # If parsing succeeds, arguments are complete
                     complete_calls.append(call_data)
                 except json.JSONDecodeError:
                     # Arguments exist but are incomplete JSON - not ready yet
                     logger.debug(
-                        f"Tool call '{name}' has incomplete arguments "
-                        f"(not valid JSON yet): {arguments[:100]}"
+                        "Tool call '%s' has incomplete arguments (not valid JSON yet): %s",
+                        name, arguments[:100],
                     )
                     continue
             else:
@@ -558,7 +771,7 @@ class ChatService:
                 # Consider it complete if name exists
                 complete_calls.append(call_data)
 
-        return complete_calls if complete_calls else []
+        return complete_calls
 
     async def generate_conversation_title(
         self, messages: List[Dict[str, str]]
@@ -601,16 +814,16 @@ Title:"""
             
             # Use chat_stream to get response
             # chat_stream is actually an async generator because _make_stream_request is async
-            full_response = ""
+            response_parts: List[str] = []
             async for chunk in self.llm_client.chat_stream(
                 messages=title_messages,
                 system_prompt=None
             ):
                 if chunk:
-                    full_response += chunk
+                    response_parts.append(chunk)
             
             # Clean up title
-            title = full_response.strip()
+            title = "".join(response_parts).strip()
             
             # Remove quotes if present
             if title.startswith('"') and title.endswith('"'):
@@ -622,7 +835,7 @@ Title:"""
             if len(title) > 60:
                 title = title[:57] + "..."
             
-            logger.info(f"Generated title: {title}")
+            logger.info("Generated title: %s", title)
             return title or "New chat"
             
         except Exception as e:
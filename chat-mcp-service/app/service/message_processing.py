@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from ..models import ChatRequest
 from ..utils.constants import MAX_CONVERSATION_TURNS
@@ -18,10 +19,13 @@ class MessageProcessingService:
         """Initialize message processing service."""
         self._get_config = config_getter
         self._mcp_registry = None
+        # (config object, registry version) -> prompt built from them
+        self._system_prompt_cache: Optional[Tuple[Any, int, str]] = None
 
     def set_mcp_registry(self, mcp_registry):
         """Set MCP registry for tool information."""
         self._mcp_registry = mcp_registry
+        self._system_prompt_cache = None
 
     def build_agent_system_prompt(self) -> str:
         """
@@ -29,14 +33,42 @@ class MessageProcessingService:
         Uses configurable template from config.yaml with {tools} placeholder.
         If {tools} placeholder is present, it will be replaced with available tools list.
         If not present, tools will be appended at the end automatically.
+
+        The result is cached until the config is reloaded or the MCP tool set
+        changes, so repeated requests reuse the exact same prompt string.
         """
+        config = None
         try:
             config = self._get_config()
             template = config.system_prompt_template
         except (ValueError, FileNotFoundError) as e:
             logger.warning(f"Could not load system prompt from config: {e}. Using default prompt.")
             template = "You are a helpful travel agent assistant. Your goal is to help users with travel-related questions and planning."
-        
+
+        registry_version = getattr(self._mcp_registry, "version", 0)
+        cached = self._system_prompt_cache
+        if (
+            cached is not None
+            and config is not None
+            and cached[0] is config
+            and cached[1] == registry_version
+        ):
+            return cached[2]
+
+        prompt = self._render_system_prompt(template)
+        if cached is not None and cached[2] != prompt:
+            # Providers cache on the exact request prefix, so every change here
+            # costs a full prefill on the next requests
+            logger.warning(
+                "System prompt changed (%d -> %d chars); provider prompt cache will miss",
+                len(cached[2]), len(prompt),
+            )
+        if config is not None:
+            self._system_prompt_cache = (config, registry_version, prompt)
+        return prompt
+
+    def _render_system_prompt(self, template: str) -> str:
+        """Fill the system prompt template with the available tools."""
         # Build tool list if tools are available
         tool_list = ""
         if self._mcp_registry:
@@ -51,6 +83,8 @@ class MessageProcessingService:
                         tool_name = getattr(tool, 'name', '')
                         tool_desc = getattr(tool, 'description', '') or ""
                     tool_descriptions.append(f"- {tool_name}: {tool_desc}")
+                # Sorted so the prompt does not depend on server load order
+                tool_descriptions.sort()
                 tool_list = "\n".join(tool_descriptions)
         
         # Replace {tools} placeholder if present, otherwise append tools at the end
@@ -62,28 +96,9 @@ class MessageProcessingService:
         else:
             prompt = template
         
-        logger.info(f"Generated system prompt (length: {len(prompt)} chars)")
+        logger.info("Generated system prompt (length: %d chars)", len(prompt))
         return prompt
 
-    def trim_history(self, messages: List[Dict[str, str]], max_turns: int = MAX_CONVERSATION_TURNS) -> List[Dict[str, str]]:
-        """
-        Trim conversation history to keep only recent messages.
-        
-        Args:
-            messages: Full conversation history
-            max_turns: Maximum number of message turns to keep
-            
-        Returns:
-            Trimmed conversation history
-        """
-        if len(messages) <= max_turns:
-            return messages
-
-        # Keep system message if exists, then recent messages
-        if messages and messages[0].get("role") == "system":
-            return [messages[0]] + messages[-(max_turns - 1):]
-        return messages[-max_turns:]
-
     def prepare_messages(self, request: ChatRequest) -> List[Dict[str, str]]:
         """
         Prepare messages from request, including file handling.
@@ -108,27 +123,34 @@ class MessageProcessingService:
 
         # Get conversation history from request
         messages = request.messages or []
+
+        # Keep history manageable: at most MAX_CONVERSATION_TURNS messages in
+        # total, including the current user message. The deque bounds the
+        # history structurally, and scanning from the newest end means older
+        # messages that would be trimmed anyway are never copied.
+        history_limit = MAX_CONVERSATION_TURNS - 1 if user_message else MAX_CONVERSATION_TURNS
+        recent: Deque[Dict[str, str]] = deque(maxlen=max(history_limit, 0))
         
         # Filter out tool messages and tool_calls - only keep user and assistant messages
         # Also remove tool_calls from assistant messages
-        filtered_messages = []
-        for msg in messages:
+        for msg in reversed(messages):
+            if len(recent) == recent.maxlen:
+                break
             role = msg.get("role", "")
             # Only include user and assistant messages
             if role in ("user", "assistant"):
                 # Create a clean message without tool_calls
-                clean_msg = {
+                # Explicitly exclude tool_calls, tool_call_id, name, etc.
+                recent.appendleft({
                     "role": role,
                     "content": msg.get("content", "") or ""  # Ensure content is always a string
-                }
-                # Explicitly exclude tool_calls, tool_call_id, name, etc.
-                filtered_messages.append(clean_msg)
+                })
             # Skip tool messages (role == "tool")
         
+        filtered_messages = list(recent)
         # Add current user message to history
         if user_message:
             filtered_messages.append({"role": "user", "content": user_message})
 
-        # Trim history to keep it manageable
-        return self.trim_history(filtered_messages)
+        return filtered_messages
 
@@ -0,0 +1,72 @@
+"""In-process cache of tool-free chat responses."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ..utils import fast_json
+from ..utils.constants import (
+    RESPONSE_CACHE_CONTEXT_MESSAGES,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Caches final answers that were produced without any tool call.
+
+    Entries are keyed on the model plus the system prompt and the last few
+    conversation messages, with whitespace and case normalized so trivially
+    different phrasings of the same question share an entry. Answers that used
+    tools are never stored, since they depend on external data that can go stale.
+    """
+
+    def __init__(
+        self,
+        ttl: float = RESPONSE_CACHE_TTL,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        context_messages: int = RESPONSE_CACHE_CONTEXT_MESSAGES,
+    ):
+        """Initialize response cache."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.context_messages = context_messages
+        # key -> (expires_at, response)
+        self._entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
+    def make_key(self, system_prompt: str, messages: List[Dict[str, str]], model: str) -> str:
+        """Build the cache key for the latest turn of a conversation answered by model."""
+        recent = [
+            (msg.get("role", ""), " ".join((msg.get("content") or "").split()).casefold())
+            for msg in messages[-self.context_messages:]
+        ]
+        raw = fast_json.dumps_bytes([model, system_prompt, recent])
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, if present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response, evicting the least recently used entries."""
+        if not response:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        logger.debug("Cached response %s (%d chars)", key[:12], len(response))
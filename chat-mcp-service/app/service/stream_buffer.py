@@ -0,0 +1,110 @@
+"""Coalescing buffer for streamed text chunks."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import AsyncGenerator, AsyncIterator, List, Optional, TypeVar
+
+from ..utils.constants import STREAM_FLUSH_INTERVAL, STREAM_MAX_BUFFERED_CHARS
+
+T = TypeVar("T")
+
+
+class StreamBuffer:
+    """
+    Coalesce small text deltas into fewer, larger chunk events.
+
+    The first chunk is always emitted immediately so time-to-first-byte is
+    unchanged; after that, text is held until the buffer reaches max_chars or
+    flush_interval seconds have passed since the last emit. Iterating the
+    upstream through paced() makes flush_interval an upper bound on how long
+    text stays buffered, even when the upstream pauses. Callers must call
+    flush() when the stream ends.
+    """
+
+    __slots__ = ("max_chars", "flush_interval", "_parts", "_size", "_last_flush", "_started")
+
+    def __init__(
+        self,
+        max_chars: int = STREAM_MAX_BUFFERED_CHARS,
+        flush_interval: float = STREAM_FLUSH_INTERVAL,
+    ):
+        self.max_chars = max_chars
+        self.flush_interval = flush_interval
+        self._parts: List[str] = []
+        self._size = 0
+        self._last_flush = 0.0
+        self._started = False
+
+    def push(self, text: str) -> Optional[str]:
+        """Add text and return the coalesced text to emit now, if any."""
+        now = time.monotonic()
+        if not self._started:
+            self._started = True
+            self._last_flush = now
+            return text
+
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.max_chars or now - self._last_flush >= self.flush_interval:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[str]:
+        """Return and clear any buffered text."""
+        if not self._parts:
+            return None
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        self._last_flush = time.monotonic()
+        return text
+
+    def flush_delay(self) -> Optional[float]:
+        """Seconds until buffered text is due (None if nothing is buffered)."""
+        if not self._parts:
+            return None
+        return max(0.0, self._last_flush + self.flush_interval - time.monotonic())
+
+    async def paced(self, stream: AsyncIterator[T]) -> AsyncGenerator[Optional[T], None]:
+        """
+        Iterate stream, yielding None whenever buffered text is due before the next item.
+
+        The caller flushes on None. A pending read is never cancelled by a
+        flush (that would abort the upstream), it is awaited again afterwards.
+        """
+        next_item: Optional[asyncio.Future] = None
+        try:
+            while True:
+                delay = self.flush_delay()
+                if delay is None and next_item is None:
+                    # Nothing buffered: read in this task, no timeout needed
+                    try:
+                        item = await stream.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    yield item
+                    continue
+
+                if next_item is None:
+                    next_item = asyncio.ensure_future(stream.__anext__())
+                done, _ = await asyncio.wait((next_item,), timeout=delay)
+                if not done:
+                    yield None
+                    continue
+
+                finished, next_item = next_item, None
+                try:
+                    item = finished.result()
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            if next_item is not None:
+                # Stopped early: end the read before the caller closes the stream
+                next_item.cancel()
+                try:
+                    await next_item
+                except (asyncio.CancelledError, Exception):
+                    # Includes StopAsyncIteration and errors of the abandoned read
+                    pass
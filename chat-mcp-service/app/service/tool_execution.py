@@ -4,13 +4,30 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import time
-from typing import Any, AsyncGenerator, Dict, List
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
-from ..mcp_tools import ToolCall
+from ..mcp_tools import ToolCall, ToolResult
+from ..utils import fast_json
+from ..utils.constants import MAX_PARALLEL_TOOL_CALLS
+from ..utils.perf import PerfTimer
+from .tool_result_store import GET_TOOL_RESULT_TOOL_NAME, ToolResultStore
 
 logger = logging.getLogger(__name__)
 
+# Shared stand-in for a tool call without a "function" entry; never mutated
+_NO_FUNCTION: Dict[str, Any] = {}
+# Argument strings of zero-argument tool calls, decoded without the JSON parser
+_EMPTY_ARGS = frozenset(("", "{}", "{ }"))
+
+
+def _has_args(tool_args_str: str) -> bool:
+    """Check whether a tool call's argument string needs to be JSON-decoded."""
+    return (
+        bool(tool_args_str)
+        and tool_args_str not in _EMPTY_ARGS
+        and not tool_args_str.isspace()
+    )
+
 
 class ToolExecutionService:
     """Service for executing tool calls."""
@@ -19,11 +36,41 @@ class ToolExecutionService:
         """Initialize tool execution service."""
         self.mcp_registry = mcp_registry
         self._format_tool_result = tool_result_formatter
+        # Resolved once instead of probing the registry on every tool call
+        self._call_tool_with_result = getattr(mcp_registry, "call_tool_with_result", None)
+
+    async def _dispatch(self, tool_call: ToolCall, result_store: ToolResultStore) -> ToolResult:
+        """Run a tool call against the built-in tools or the MCP registry."""
+        if tool_call.name == GET_TOOL_RESULT_TOOL_NAME:
+            args = tool_call.arguments
+            return ToolResult(
+                tool_name=tool_call.name,
+                success=True,
+                result=result_store.read(args.get("tool_call_id", ""), args.get("offset", 0)),
+            )
+        # Use call_tool_with_result for backward compatibility with ToolCall
+        call_tool_with_result = self._call_tool_with_result
+        if call_tool_with_result is not None:
+            return await call_tool_with_result(tool_call)
+        # Fallback: direct call
+        result = await self.mcp_registry.call_tool(tool_call.name, tool_call.arguments)
+        return ToolResult(
+            tool_name=tool_call.name,
+            success=True,
+            result=result
+        )
+
+    @staticmethod
+    def _tool_message(call_id: str, name: str, content: str) -> Dict[str, str]:
+        """Build the conversation message carrying a tool's result back to the LLM."""
+        return {"role": "tool", "tool_call_id": call_id, "name": name, "content": content}
 
     async def execute_single_tool(
         self,
         tool_call_data: Dict[str, Any],
-        messages: List[Dict[str, str]]
+        messages: List[Dict[str, str]],
+        result_store: ToolResultStore,
+        tool_args: Optional[Dict[str, Any]] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Execute a single tool call and yield events.
@@ -31,21 +78,27 @@ class ToolExecutionService:
         Args:
             tool_call_data: Tool call data from LLM
             messages: Conversation messages (will be updated with tool result)
+            result_store: Stored tool results of the current chat request
+            tool_args: Arguments already parsed by the caller (parsed from
+                tool_call_data when omitted)
             
         Yields:
             Tool call events (start, end, or error)
         """
         tool_call_id = tool_call_data.get("id", "")
-        tool_name = tool_call_data.get("function", {}).get("name", "")
-        tool_args_str = tool_call_data.get("function", {}).get("arguments", "{}")
+        function = tool_call_data.get("function") or _NO_FUNCTION
+        tool_name = function.get("name", "")
+        tool_args_str = function.get("arguments", "{}")
         
         # Parse arguments
         try:
-            tool_args = json.loads(tool_args_str) if tool_args_str else {}
+            if tool_args is None:
+                tool_args = fast_json.loads(tool_args_str) if _has_args(tool_args_str) else {}
         except json.JSONDecodeError as e:
             logger.error(
-                f"Failed to parse tool arguments for '{tool_name}' (id: {tool_call_id}): "
-                f"{tool_args_str[:200]}. Error: {e}. This indicates incomplete arguments were sent."
+                "Failed to parse tool arguments for '%s' (id: %s): %s. Error: %s. "
+                "This indicates incomplete arguments were sent.",
+                tool_name, tool_call_id, tool_args_str[:200], e,
             )
             # Don't execute tool with invalid arguments - return error message
             yield {
@@ -55,16 +108,13 @@ class ToolExecutionService:
                 "error": f"工具参数解析失败：参数格式不完整或无效。原始参数: {tool_args_str[:100]}"
             }
             # Add error message to conversation
-            messages.append({
-                "role": "tool",
-                "tool_call_id": tool_call_id,
-                "name": tool_name,
-                "content": f"错误：工具参数格式无效，无法执行工具。请重试。"
-            })
+            messages.append(self._tool_message(
+                tool_call_id, tool_name, "错误：工具参数格式无效，无法执行工具。请重试。"
+            ))
             return  # Stop execution
         
         # Yield tool call start event
-        logger.info(f"Yielding tool_call_start event for tool: {tool_name}, id: {tool_call_id}")
+        logger.info("Yielding tool_call_start event for tool: %s, id: %s", tool_name, tool_call_id)
         yield {
             "type": "tool_call_start",
             "tool": tool_name,
@@ -80,21 +130,8 @@ class ToolExecutionService:
         )
         
         try:
-            exec_start = time.time()
-            # Use call_tool_with_result for backward compatibility with ToolCall
-            if hasattr(self.mcp_registry, 'call_tool_with_result'):
-                tool_result = await self.mcp_registry.call_tool_with_result(tool_call)
-            else:
-                # Fallback: direct call
-                result = await self.mcp_registry.call_tool(tool_call.name, tool_call.arguments)
-                from ..mcp_tools import ToolResult
-                tool_result = ToolResult(
-                    tool_name=tool_call.name,
-                    success=True,
-                    result=result
-                )
-            exec_time = time.time() - exec_start
-            logger.info(f"[PERF] Tool '{tool_name}' execution (async) took {exec_time:.3f}s")
+            with PerfTimer(logger, "Tool '%s' execution (async)", tool_name):
+                tool_result = await self._dispatch(tool_call, result_store)
             
             if tool_result.success:
                 # Yield tool call end event
@@ -106,22 +143,12 @@ class ToolExecutionService:
                 }
                 
                 # Format tool result content for LLM
-                format_start = time.time()
-                tool_content = self._format_tool_result(tool_result.result, tool_name)
-                format_time = time.time() - format_start
-                logger.info(
-                    f"[PERF] Tool '{tool_name}' result formatting took {format_time:.3f}s, "
-                    f"content length: {len(tool_content)} chars"
-                )
+                with PerfTimer(logger, "Tool '%s' result formatting", tool_name):
+                    tool_content = self._format_tool_result(tool_result.result, tool_name)
                 
-                # Add tool result to messages
-                tool_message = {
-                    "role": "tool",
-                    "tool_call_id": tool_call_id,
-                    "name": tool_name,
-                    "content": tool_content
-                }
-                messages.append(tool_message)
+                # Add tool result to messages (whole; the caller shortens it once a
+                # later iteration has answered from it)
+                messages.append(self._tool_message(tool_call_id, tool_name, tool_content))
             else:
                 # Yield tool call error event
                 error_msg = tool_result.error or "Unknown error"
@@ -131,32 +158,24 @@ class ToolExecutionService:
                     "tool_call_id": tool_call_id,
                     "error": error_msg
                 }
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call_id,
-                    "name": tool_name,
-                    "content": f"Error: {error_msg}"
-                })
+                messages.append(self._tool_message(tool_call_id, tool_name, f"Error: {error_msg}"))
         except Exception as e:
-            logger.error(f"[PERF] Tool '{tool_name}' failed: {e}", exc_info=True)
+            logger.error("[PERF] Tool '%s' failed: %s", tool_name, e, exc_info=True)
             yield {
                 "type": "tool_call_error",
                 "tool": tool_name,
                 "tool_call_id": tool_call_id,
                 "error": str(e)
             }
-            messages.append({
-                "role": "tool",
-                "tool_call_id": tool_call_id,
-                "name": tool_name,
-                "content": f"Error: {str(e)}"
-            })
+            messages.append(self._tool_message(tool_call_id, tool_name, f"Error: {e}"))
 
     async def execute_tool_calls(
         self,
         tool_calls: List[Dict[str, Any]],
         content: str,
-        messages: List[Dict[str, str]]
+        messages: List[Dict[str, str]],
+        result_store: ToolResultStore,
+        parsed_args: Optional[Dict[str, Dict[str, Any]]] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Execute multiple tool calls and yield events.
@@ -167,6 +186,8 @@ class ToolExecutionService:
             tool_calls: List of tool call data from LLM
             content: Assistant message content
             messages: Conversation messages (will be updated with tool results)
+            result_store: Stored tool results of the current chat request
+            parsed_args: Arguments already parsed by the caller, by tool call id
             
         Yields:
             Tool call events for each tool
@@ -180,19 +201,26 @@ class ToolExecutionService:
         
         # If multiple tools, execute in parallel for better performance
         if len(tool_calls) > 1:
-            logger.info(f"[PERF] Executing {len(tool_calls)} tools in parallel (async)")
+            logger.info("[PERF] Executing %d tools in parallel (async)", len(tool_calls))
             # Execute tools in parallel using async
-            async for event in self.execute_tools_parallel(tool_calls, messages):
+            async for event in self.execute_tools_parallel(
+                tool_calls, messages, result_store, parsed_args
+            ):
                 yield event
         else:
             # Single tool, execute asynchronously
-            async for event in self.execute_single_tool(tool_calls[0], messages):
+            tool_args = parsed_args.get(tool_calls[0].get("id", "")) if parsed_args else None
+            async for event in self.execute_single_tool(
+                tool_calls[0], messages, result_store, tool_args
+            ):
                 yield event
 
     async def execute_tools_parallel(
         self,
         tool_calls: List[Dict[str, Any]],
-        messages: List[Dict[str, str]]
+        messages: List[Dict[str, str]],
+        result_store: ToolResultStore,
+        parsed_args: Optional[Dict[str, Dict[str, Any]]] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Execute multiple tool calls in parallel and yield events.
@@ -200,19 +228,30 @@ class ToolExecutionService:
         Args:
             tool_calls: List of tool call data from LLM
             messages: Conversation messages (will be updated with tool results)
+            result_store: Stored tool results of the current chat request
+            parsed_args: Arguments already parsed by the caller, by tool call id
             
         Yields:
-            Tool call events for each tool (in the order they complete)
+            Tool call events for each tool (end/error events in the order they
+            complete; tool messages are appended in the original call order)
         """
+        if parsed_args is None:
+            parsed_args = {}
+        # Arguments are parsed once here and reused when the tools are dispatched
+        call_args: List[Dict[str, Any]] = []
         # Yield start events for all tools first
         for tool_call_data in tool_calls:
             tool_call_id = tool_call_data.get("id", "")
-            tool_name = tool_call_data.get("function", {}).get("name", "")
-            tool_args_str = tool_call_data.get("function", {}).get("arguments", "{}")
-            try:
-                tool_args = json.loads(tool_args_str)
-            except json.JSONDecodeError:
-                tool_args = {}
+            function = tool_call_data.get("function") or _NO_FUNCTION
+            tool_name = function.get("name", "")
+            tool_args = parsed_args.get(tool_call_id)
+            if tool_args is None:
+                tool_args_str = function.get("arguments", "{}")
+                try:
+                    tool_args = fast_json.loads(tool_args_str) if _has_args(tool_args_str) else {}
+                except json.JSONDecodeError:
+                    tool_args = {}
+            call_args.append(tool_args)
             
             yield {
                 "type": "tool_call_start",
@@ -221,94 +260,75 @@ class ToolExecutionService:
                 "input": tool_args
             }
         
-        # Execute all tools in parallel
-        async def execute_tool_async(tool_call_data: Dict[str, Any]) -> Dict[str, Any]:
-            """Execute a single tool asynchronously and return result."""
+        # Bounds how many tools of this response hit their backends at once
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_TOOL_CALLS)
+
+        async def execute_tool_async(
+            index: int, tool_call_data: Dict[str, Any], tool_args: Dict[str, Any]
+        ) -> Tuple[int, Any, Optional[str]]:
+            """
+            Execute a single tool and return its index with the ToolResult or exception,
+            plus the result formatted for the LLM when the tool succeeded.
+            """
             tool_call_id = tool_call_data.get("id", "")
-            tool_name = tool_call_data.get("function", {}).get("name", "")
-            tool_args_str = tool_call_data.get("function", {}).get("arguments", "{}")
-            try:
-                tool_args = json.loads(tool_args_str)
-            except json.JSONDecodeError:
-                tool_args = {}
-            
+            tool_name = (tool_call_data.get("function") or _NO_FUNCTION).get("name", "")
             tool_call = ToolCall(name=tool_name, arguments=tool_args, id=tool_call_id)
             try:
-                # Use call_tool_with_result for backward compatibility with ToolCall
-                if hasattr(self.mcp_registry, 'call_tool_with_result'):
-                    tool_result = await self.mcp_registry.call_tool_with_result(tool_call)
-                else:
-                    # Fallback: direct call
-                    result = await self.mcp_registry.call_tool(tool_call.name, tool_call.arguments)
-                    from ..mcp_tools import ToolResult
-                    tool_result = ToolResult(
-                        tool_name=tool_call.name,
-                        success=True,
-                        result=result
-                    )
-                return {
-                    "tool_call_id": tool_call_id,
-                    "tool_name": tool_name,
-                    "success": True,
-                    "result": tool_result
-                }
+                async with semaphore:
+                    tool_result = await self._dispatch(tool_call, result_store)
+                if not tool_result.success:
+                    return index, tool_result, None
+                # Formatted in this task (outside the semaphore), so a result that
+                # cannot be formatted only fails its own tool
+                return index, tool_result, self._format_tool_result(
+                    tool_result.result, tool_name
+                )
             except Exception as e:
-                return {
-                    "tool_call_id": tool_call_id,
-                    "tool_name": tool_name,
-                    "success": False,
-                    "error": str(e)
-                }
+                # Isolate failures per tool (including results that cannot be
+                # formatted): the others still deliver their results
+                return index, e, None
         
-        # Execute all tools concurrently
-        tasks = [execute_tool_async(tc) for tc in tool_calls]
-        results = await asyncio.gather(*tasks)
-        
-        # Yield end/error events for each tool
-        for result in results:
-            tool_call_id = result["tool_call_id"]
-            tool_name = result["tool_name"]
-            
-            if result["success"]:
-                tool_result = result["result"]
-                if tool_result.success:
+        # Execute all tools concurrently and report each one as soon as it finishes
+        tasks = [
+            asyncio.create_task(execute_tool_async(index, tc, args))
+            for index, (tc, args) in enumerate(zip(tool_calls, call_args))
+        ]
+        tool_messages: List[Optional[Dict[str, Any]]] = [None] * len(tool_calls)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, tool_result, tool_content = await next_done
+                # Results that finished together are handed out without suspending;
+                # let other streams run between them
+                await asyncio.sleep(0)
+                tool_call_data = tool_calls[index]
+                tool_call_id = tool_call_data.get("id", "")
+                tool_name = (tool_call_data.get("function") or _NO_FUNCTION).get("name", "")
+                
+                if isinstance(tool_result, Exception):
+                    error_msg = str(tool_result)
+                elif not tool_result.success:
+                    error_msg = tool_result.error or "Unknown error"
+                else:
                     yield {
                         "type": "tool_call_end",
                         "tool": tool_name,
                         "tool_call_id": tool_call_id,
                         "result": tool_result.result
                     }
-                    tool_content = self._format_tool_result(tool_result.result, tool_name)
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call_id,
-                        "name": tool_name,
-                        "content": tool_content
-                    })
-                else:
-                    yield {
-                        "type": "tool_call_error",
-                        "tool": tool_name,
-                        "tool_call_id": tool_call_id,
-                        "error": tool_result.error or "Unknown error"
-                    }
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call_id,
-                        "name": tool_name,
-                        "content": f"Error: {tool_result.error or 'Unknown error'}"
-                    })
-            else:
+                    tool_messages[index] = self._tool_message(tool_call_id, tool_name, tool_content)
+                    continue
+                
                 yield {
                     "type": "tool_call_error",
                     "tool": tool_name,
                     "tool_call_id": tool_call_id,
-                    "error": result["error"]
+                    "error": error_msg
                 }
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call_id,
-                    "name": tool_name,
-                    "content": f"Error: {result['error']}"
-                })
-
+                tool_messages[index] = self._tool_message(tool_call_id, tool_name, f"Error: {error_msg}")
+        finally:
+            # Client disconnected mid-way: don't leave tools running in the background
+            for task in tasks:
+                task.cancel()
+        
+        # Tool messages must follow the assistant message in tool_calls order
+        messages.extend(tool_messages)
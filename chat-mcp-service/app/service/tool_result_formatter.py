@@ -1,12 +1,20 @@
 """Tool result formatting logic for chat service."""
 from __future__ import annotations
 
-import json
 import logging
+import re
 from typing import Any
 
+from ..utils import fast_json
+
 logger = logging.getLogger(__name__)
 
+# Indicators that a tool did not find useful information
+_NO_INFO_RE = re.compile(r"没有找到|未能找到|找不到|无法找到")
+
+# Phrases showing the response already suggests contacting Harry
+_CONTACT_HARRY_RE = re.compile(r"联系 ?[Hh]arry|contact [Hh]arry")
+
 
 def format_tool_result_for_llm(tool_result: Any, tool_name: str) -> str:
     """
@@ -20,12 +28,14 @@ def format_tool_result_for_llm(tool_result: Any, tool_name: str) -> str:
         Formatted string content for LLM
     """
     if isinstance(tool_result, str):
-        logger.debug(f"Tool {tool_name} returned string result (length: {len(tool_result)})")
+        logger.debug("Tool %s returned string result (length: %d)", tool_name, len(tool_result))
         return tool_result
     elif isinstance(tool_result, dict):
         # If it's a dict, check if it has a 'text' key (from MCPClient fallback)
         if "text" in tool_result:
-            logger.debug(f"Tool {tool_name} returned dict with 'text' key (length: {len(tool_result['text'])})")
+            logger.debug(
+                "Tool %s returned dict with 'text' key (length: %d)", tool_name, len(tool_result["text"])
+            )
             return tool_result["text"]
         
         # Handle tools that return answer field (like FAQ tool)
@@ -38,7 +48,9 @@ def format_tool_result_for_llm(tool_result: Any, tool_name: str) -> str:
                 # Tool didn't find an answer - format clearly for LLM
                 message = tool_result.get("message", "未找到匹配的答案。")
                 formatted = f"工具结果: {message}\n建议: 可以尝试使用其他工具搜索相关信息。"
-                logger.info(f"Tool {tool_name} did not find answer, formatted for LLM: {formatted[:100]}")
+                logger.info(
+                    "Tool %s did not find answer, formatted for LLM: %s", tool_name, formatted[:100]
+                )
                 return formatted
             else:
                 # Tool found an answer - format clearly to indicate this is the complete answer
@@ -55,7 +67,9 @@ def format_tool_result_for_llm(tool_result: Any, tool_name: str) -> str:
 5. 如果需要对内容进行重新组织，保持所有事实和细节与工具结果完全一致
 
 请基于上述工具结果生成回答。"""
-                logger.info(f"Tool {tool_name} found answer, formatted for LLM (length: {len(answer)})")
+                logger.info(
+                    "Tool %s found answer, formatted for LLM (length: %d)", tool_name, len(answer)
+                )
                 return formatted
         
         # Handle tools that return results field but found no results
@@ -71,11 +85,11 @@ def format_tool_result_for_llm(tool_result: Any, tool_name: str) -> str:
 2. 不要编造或猜测答案
 3. 如果还有其他工具可用，可以建议尝试其他工具
 4. 如果所有工具都没有找到有用信息，提醒用户联系Harry获取更具体的帮助"""
-                logger.info(f"Tool {tool_name} found no results, formatted for LLM")
+                logger.info("Tool %s found no results, formatted for LLM", tool_name)
                 return formatted
             
             # If results are found, format them with instructions
-            results_text = json.dumps(results, ensure_ascii=False, indent=2)
+            results_text = fast_json.dumps(results, indent=True)
             formatted = f"""工具返回的结果（必须严格基于此结果回答，不要添加其他信息）：
 
 {results_text}
@@ -88,17 +102,23 @@ def format_tool_result_for_llm(tool_result: Any, tool_name: str) -> str:
 5. 如果工具结果不足以完整回答问题，明确说明哪些信息缺失
 
 请基于上述工具结果生成回答。"""
-            logger.info(f"Tool {tool_name} found {len(results)} results, formatted for LLM")
+            logger.info("Tool %s found %d results, formatted for LLM", tool_name, len(results))
             return formatted
         
         # Otherwise, serialize the dict as JSON
-        content = json.dumps(tool_result, ensure_ascii=False)
-        logger.debug(f"Tool {tool_name} returned dict (serialized length: {len(content)}, keys: {list(tool_result.keys())})")
+        content = fast_json.dumps(tool_result)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Tool %s returned dict (serialized length: %d, keys: %s)",
+                tool_name, len(content), list(tool_result.keys()),
+            )
         return content
     else:
         # Fallback: convert to string
         content = str(tool_result)
-        logger.debug(f"Tool {tool_name} returned non-string/dict result (converted length: {len(content)})")
+        logger.debug(
+            "Tool %s returned non-string/dict result (converted length: %d)", tool_name, len(content)
+        )
         return content
 
 
@@ -112,22 +132,9 @@ def check_tools_used_but_no_info(messages: list[dict[str, str]]) -> bool:
     Returns:
         True if tools were used but didn't find useful information
     """
-    tool_messages = [msg for msg in messages if msg.get("role") == "tool"]
-    if not tool_messages:
-        return False
-    
     # Check if any tool message indicates no useful information was found
-    for msg in tool_messages:
-        content = msg.get("content", "")
-        # Check for indicators that tools didn't find useful information
-        if any(indicator in content for indicator in [
-            "没有找到",
-            "没有找到匹配",
-            "没有找到相关信息",
-            "未能找到",
-            "找不到",
-            "无法找到"
-        ]):
+    for msg in messages:
+        if msg.get("role") == "tool" and _NO_INFO_RE.search(msg.get("content") or ""):
             return True
     
     return False
@@ -143,6 +150,5 @@ def response_suggests_contact_harry(content: str) -> bool:
     Returns:
         True if response already suggests contacting Harry
     """
-    harry_indicators = ["联系Harry", "联系harry", "联系 Harry", "联系 harry", "contact Harry", "contact harry"]
-    return any(indicator in content for indicator in harry_indicators)
+    return _CONTACT_HARRY_RE.search(content) is not None
 
@@ -0,0 +1,114 @@
+"""In-process store for large tool results referenced from the conversation."""
+from __future__ import annotations
+
+import itertools
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from ..utils.constants import MAX_INLINE_TOOL_RESULT_CHARS, MAX_STORED_TOOL_RESULTS
+
+logger = logging.getLogger(__name__)
+
+GET_TOOL_RESULT_TOOL_NAME = "get_tool_result"
+
+# Built-in function definition that lets the LLM page through a shortened result
+GET_TOOL_RESULT_FUNCTION: Dict[str, Any] = {
+    "name": GET_TOOL_RESULT_TOOL_NAME,
+    "description": (
+        "Read more of a large tool result that was shortened in the conversation. "
+        "Only use this when a tool result says it was truncated and the visible "
+        "part is not enough to answer."
+    ),
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "tool_call_id": {
+                "type": "string",
+                "description": "The id given in the truncated tool result",
+            },
+            "offset": {
+                "type": "integer",
+                "description": "Character offset to continue reading from",
+            },
+        },
+        "required": ["tool_call_id"],
+    },
+}
+
+
+class ToolResultStore:
+    """
+    Keeps full tool results out of the prompt.
+
+    The newest tool results go to the LLM whole, since the next turn answers
+    from them. Once a later iteration re-sends the conversation, results longer
+    than max_inline_chars are stored by tool_call_id and replaced with a preview
+    plus a reference, so every later round-trip does not re-send the whole
+    payload. One store is created per chat request, so a reference can only
+    read results of that same request.
+    """
+
+    def __init__(
+        self,
+        max_inline_chars: int = MAX_INLINE_TOOL_RESULT_CHARS,
+        max_entries: int = MAX_STORED_TOOL_RESULTS,
+    ):
+        """Initialize tool result store."""
+        self.max_inline_chars = max_inline_chars
+        self.max_entries = max_entries
+        self._results: OrderedDict[str, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of stored results."""
+        return len(self._results)
+
+    def compact_messages(self, messages: List[Dict[str, Any]], start: int = 0) -> None:
+        """Replace large tool results in messages[start:] with previews, in place."""
+        for message in itertools.islice(messages, start, None):
+            # get_tool_result messages are already a single page of a stored result
+            if message.get("role") == "tool" and message.get("name") != GET_TOOL_RESULT_TOOL_NAME:
+                message["content"] = self.compact(message["tool_call_id"], message["content"])
+
+    def compact(self, tool_call_id: str, content: str) -> str:
+        """
+        Return the content to put into the conversation for a tool result.
+
+        Small results are returned unchanged; large ones are stored and replaced
+        with their first page plus a note on how to read the rest.
+        """
+        if len(content) <= self.max_inline_chars or not tool_call_id:
+            return content
+
+        self._results[tool_call_id] = content
+        self._results.move_to_end(tool_call_id)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+        logger.info(
+            "Stored large tool result %s (%d chars), sending a %d char preview",
+            tool_call_id, len(content), self.max_inline_chars,
+        )
+        return self._page(tool_call_id, content, 0)
+
+    def read(self, tool_call_id: str, offset: int = 0) -> str:
+        """Read one page of a stored result starting at offset."""
+        content = self._results.get(tool_call_id)
+        if content is None:
+            return f"未找到工具结果: {tool_call_id}"
+        offset = max(0, int(offset or 0))
+        if offset >= len(content):
+            return f"工具结果 {tool_call_id} 已全部读取（共 {len(content)} 字符）。"
+        return self._page(tool_call_id, content, offset)
+
+    def _page(self, tool_call_id: str, content: str, offset: int) -> str:
+        """Slice one page out of content and describe what remains."""
+        end = offset + self.max_inline_chars
+        page = content[offset:end]
+        if end >= len(content):
+            return page
+        return (
+            f"{page}\n\n[结果已截断：共 {len(content)} 字符，已显示 {offset}-{end}。"
+            f"如需更多内容，请调用 {GET_TOOL_RESULT_TOOL_NAME}"
+            f"(tool_call_id=\"{tool_call_id}\", offset={end})]"
+        )
@@ -17,6 +17,21 @@ MAX_FILE_SIZE_BYTES = 5 * 1024 * 1024  # 5MB in bytes
 # Conversation limits
 MAX_CONVERSATION_TURNS = 30  # Maximum number of message turns to keep in history
 
+# Tool result limits
+MAX_INLINE_TOOL_RESULT_CHARS = 8000  # Larger tool results are stored and sent as a preview
+MAX_STORED_TOOL_RESULTS = 256  # Maximum number of large tool results kept in memory
+MAX_PARALLEL_TOOL_CALLS = 8  # Maximum tools of one LLM response running at the same time
+
+# Response cache (tool-free answers only)
+RESPONSE_CACHE_TTL = 24 * 3600  # Seconds a cached answer stays valid
+RESPONSE_CACHE_MAX_ENTRIES = 512  # Maximum number of cached answers kept in memory
+RESPONSE_CACHE_CONTEXT_MESSAGES = 3  # Latest user message plus the turn before it
+
+# Streaming
+STREAM_MAX_BUFFERED_CHARS = 8192  # Flush coalesced text once this many chars are buffered
+STREAM_FLUSH_INTERVAL = 0.025  # Maximum seconds coalesced text is held before it is sent
+FALLBACK_STREAM_TIMEOUT = 20.0  # Seconds allowed for the no-tools retry after an empty response
+
 # Supported file extensions
 TEXT_EXTENSIONS = (".txt", ".md", ".json", ".text")
 BINARY_EXTENSIONS = (".pdf", ".doc", ".docx")
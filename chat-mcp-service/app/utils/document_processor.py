@@ -4,12 +4,27 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from app.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Markdown headings (# ## ### etc.), one per line
+_HEADING_RE = re.compile(r'^(#{1,6}\s+.+)$', re.MULTILINE)
+# Paragraph breaks (one or more blank lines)
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n\n+')
+
+
+def _stripped_span(content: str, start: int, end: int) -> Optional[Tuple[str, int]]:
+    """Get content[start:end] stripped, with its start offset (None if blank)."""
+    piece = content[start:end]
+    text = piece.strip()
+    if not text:
+        return None
+    # Everything before the first non-whitespace character was stripped
+    return text, start + piece.find(text[0])
+
 
 @dataclass
 class DocumentChunk:
@@ -71,14 +86,14 @@ class DocumentChunker:
         chunks = []
         chunk_index = 0
         
-        for segment in segments:
+        for segment, segment_start in segments:
             if len(segment) <= self.chunk_size:
                 # Segment fits in one chunk
                 chunk = DocumentChunk(
                     text=segment,
                     chunk_index=chunk_index,
-                    start_pos=content.find(segment),
-                    end_pos=content.find(segment) + len(segment),
+                    start_pos=segment_start,
+                    end_pos=segment_start + len(segment),
                     metadata={
                         "file_name": file_name,
                         "strategy": "structure_boundary",
@@ -88,50 +103,50 @@ class DocumentChunker:
                 chunk_index += 1
             else:
                 # Segment is too large, split by character count with overlap
-                sub_chunks = self._split_by_char_count(segment, chunk_index)
+                sub_chunks = self._split_by_char_count(segment, chunk_index, segment_start)
                 chunks.extend(sub_chunks)
                 chunk_index += len(sub_chunks)
         
         # Merge very small chunks with adjacent chunks
-        chunks = self._merge_small_chunks(chunks, content)
+        chunks = self._merge_small_chunks(chunks)
         
         logger.info(f"Created {len(chunks)} chunks from document (chunk_size={self.chunk_size}, overlap={self.chunk_overlap})")
         return chunks
     
-    def _split_by_structure(self, content: str) -> List[str]:
+    def _split_by_structure(self, content: str) -> List[Tuple[str, int]]:
         """
         Split content by markdown structure (headings, paragraphs).
         
+        Segment offsets are taken from the split positions, so nothing has to
+        be searched for in the document afterwards.
+        
         Returns:
-            List of text segments
+            List of (text segment, start offset in content) tuples
         """
         segments = []
         
-        # Pattern to match markdown headings (# ## ### etc.)
-        heading_pattern = re.compile(r'^(#{1,6}\s+.+)$', re.MULTILINE)
-        
         # Find all heading positions
         headings = []
-        for match in heading_pattern.finditer(content):
+        for match in _HEADING_RE.finditer(content):
             headings.append((match.start(), match.end(), match.group()))
         
         # Split by headings and paragraphs
         if not headings:
             # No headings, split by paragraphs (double newlines)
-            segments = [s.strip() for s in re.split(r'\n\n+', content) if s.strip()]
+            segments = self._split_paragraphs(content, 0, len(content))
         else:
             # Split by headings, preserving heading with following content
             last_pos = 0
             for i, (start, end, heading_text) in enumerate(headings):
                 # Get content before this heading
                 if start > last_pos:
-                    prev_content = content[last_pos:start].strip()
+                    prev_content = _stripped_span(content, last_pos, start)
                     if prev_content:
                         segments.append(prev_content)
                 
                 # Get content after this heading (until next heading or end)
                 next_start = headings[i + 1][0] if i + 1 < len(headings) else len(content)
-                heading_content = content[start:next_start].strip()
+                heading_content = _stripped_span(content, start, next_start)
                 if heading_content:
                     segments.append(heading_content)
                 
@@ -139,30 +154,54 @@ class DocumentChunker:
             
             # Add remaining content after last heading
             if last_pos < len(content):
-                remaining = content[last_pos:].strip()
+                remaining = _stripped_span(content, last_pos, len(content))
                 if remaining:
                     segments.append(remaining)
         
         # Further split very long segments by paragraphs
         final_segments = []
-        for segment in segments:
+        for segment, segment_start in segments:
             if len(segment) <= self.chunk_size * 2:
                 # Segment is not too long, keep as is
-                final_segments.append(segment)
+                final_segments.append((segment, segment_start))
             else:
                 # Split by paragraphs
-                paragraphs = [p.strip() for p in re.split(r'\n\n+', segment) if p.strip()]
-                final_segments.extend(paragraphs)
+                final_segments.extend(
+                    self._split_paragraphs(content, segment_start, segment_start + len(segment))
+                )
         
-        return [s for s in final_segments if s.strip()]
+        return final_segments
     
-    def _split_by_char_count(self, text: str, start_index: int) -> List[DocumentChunk]:
+    @staticmethod
+    def _split_paragraphs(content: str, start: int, end: int) -> List[Tuple[str, int]]:
+        """
+        Split content[start:end] at blank lines without slicing out the range first.
+        
+        Returns:
+            List of non-blank (stripped paragraph, start offset in content) tuples
+        """
+        paragraphs = []
+        last_pos = start
+        for match in _PARAGRAPH_SPLIT_RE.finditer(content, start, end):
+            paragraph = _stripped_span(content, last_pos, match.start())
+            if paragraph:
+                paragraphs.append(paragraph)
+            last_pos = match.end()
+        paragraph = _stripped_span(content, last_pos, end)
+        if paragraph:
+            paragraphs.append(paragraph)
+        return paragraphs
+    
+    def _split_by_char_count(
+        self, text: str, start_index: int, base_pos: int = 0
+    ) -> List[DocumentChunk]:
         """
         Split text by character count with overlap.
         
         Args:
             text: Text to split
             start_index: Starting chunk index
+            base_pos: Offset of text in the original document
             
         Returns:
             List of DocumentChunk objects
@@ -192,13 +231,14 @@ class DocumentChunker:
                     if word_end > start + self.min_chunk_size:
                         end = word_end + 1
             
-            chunk_text = text[start:end].strip()
-            if chunk_text:
+            span = _stripped_span(text, start, end)
+            if span:
+                chunk_text, chunk_start = span
                 chunk = DocumentChunk(
                     text=chunk_text,
                     chunk_index=chunk_idx,
-                    start_pos=start,
-                    end_pos=end,
+                    start_pos=base_pos + chunk_start,
+                    end_pos=base_pos + chunk_start + len(chunk_text),
                     metadata={
                         "strategy": "char_count",
                     },
@@ -213,13 +253,17 @@ class DocumentChunker:
         
         return chunks
     
-    def _merge_small_chunks(self, chunks: List[DocumentChunk], original_content: str) -> List[DocumentChunk]:
+    def _merge_small_chunks(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
         """
         Merge chunks that are too small with adjacent chunks.
         
+        A small chunk keeps absorbing the chunks after it until it reaches
+        min_chunk_size or the next one would not fit; each run is joined once.
+        Chunk positions are already document offsets, so a merged chunk spans
+        from the start of its first chunk to the end of its last.
+        
         Args:
             chunks: List of chunks to process
-            original_content: Original document content for position recalculation
             
         Returns:
             List of merged chunks
@@ -228,41 +272,43 @@ class DocumentChunker:
             return chunks
         
         merged = []
+        max_merged_len = self.chunk_size * 1.5  # Allow some flexibility
         i = 0
         
         while i < len(chunks):
             current = chunks[i]
+            i += 1
             
-            # If chunk is too small, try to merge with next
-            if len(current.text) < self.min_chunk_size and i + 1 < len(chunks):
-                next_chunk = chunks[i + 1]
-                
-                # Check if merging would exceed chunk_size
-                merged_text = current.text + "\n\n" + next_chunk.text
-                if len(merged_text) <= self.chunk_size * 1.5:  # Allow some flexibility
-                    # Merge chunks
-                    merged_chunk = DocumentChunk(
-                        text=merged_text,
-                        chunk_index=current.chunk_index,
-                        start_pos=current.start_pos,
-                        end_pos=next_chunk.end_pos,
-                        metadata={
-                            **current.metadata,
-                            "merged": True,
-                            "original_chunks": 2,
-                        },
-                    )
-                    merged.append(merged_chunk)
-                    i += 2  # Skip next chunk as it's merged
-                    continue
+            # If chunk is too small, try to merge with the following ones
+            parts = [current.text]
+            merged_len = len(current.text)
+            last = current
+            while merged_len < self.min_chunk_size and i < len(chunks):
+                next_chunk = chunks[i]
+                # Check if merging would exceed chunk_size ("\n\n" separator)
+                next_len = merged_len + 2 + len(next_chunk.text)
+                if next_len > max_merged_len:
+                    break
+                parts.append(next_chunk.text)
+                merged_len = next_len
+                last = next_chunk
+                i += 1
             
-            merged.append(current)
-            i += 1
-        
-        # Recalculate positions based on original content
-        for chunk in merged:
-            chunk.start_pos = original_content.find(chunk.text[:50])  # Approximate
-            chunk.end_pos = chunk.start_pos + len(chunk.text)
+            if len(parts) == 1:
+                merged.append(current)
+                continue
+            
+            merged.append(DocumentChunk(
+                text="\n\n".join(parts),
+                chunk_index=current.chunk_index,
+                start_pos=current.start_pos,
+                end_pos=last.end_pos,
+                metadata={
+                    **current.metadata,
+                    "merged": True,
+                    "original_chunks": len(parts),
+                },
+            ))
         
         return merged
     
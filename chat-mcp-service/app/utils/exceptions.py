@@ -1,5 +1,7 @@
 """Custom exceptions and error handling utilities."""
 
+import re
+from functools import lru_cache
 from typing import Optional
 
 
@@ -18,6 +20,68 @@ class ConfigurationError(TravelAgentError):
     pass
 
 
+# Error categories in priority order: when several match, the first one listed
+# wins regardless of where it appears in the error text
+_ERROR_MESSAGES = {
+    # DNS/network resolution errors (also covers "Name or service not known")
+    "dns": (
+        "Network connection error: Unable to resolve server address. "
+        "This may be due to: 1) Network connectivity issues 2) DNS resolution problems "
+        "3) Firewall or proxy blocking the connection. "
+        "Please check your network connection and try again."
+    ),
+    "reset": (
+        "Connection was reset. This might be due to large file size or network instability. "
+        "Please try: 1) Upload smaller files 2) Check network connection 3) Retry later"
+    ),
+    "timeout": (
+        "Request timeout: Processing took too long. "
+        "Please try uploading smaller files or upload in batches."
+    ),
+    "connection": (
+        "Connection error: Unable to connect to AI service. "
+        "Please check network connection or retry later."
+    ),
+    "lookup": (
+        "DNS resolution error: Unable to resolve the server address. "
+        "Please check your network connection and DNS settings."
+    ),
+}
+_ERROR_PRIORITY = {category: rank for rank, category in enumerate(_ERROR_MESSAGES)}
+
+# One alternation for all categories, so the error text is scanned once
+_ERROR_CLASSIFIER = re.compile(
+    r"(?P<dns>nodename nor servname provided|not known)"
+    r"|(?P<reset>Connection reset)"
+    r"|(?P<timeout>(?i:timeout|timed out))"
+    r"|(?P<connection>(?i:connect))"
+    r"|(?P<lookup>getaddrinfo failed)"
+)
+
+
+@lru_cache(maxsize=256)
+def _classify_error(error_str: str) -> Optional[str]:
+    """
+    Get the user-facing message for an error text, or None if it is not a known category.
+    
+    Cached because failures tend to repeat verbatim (e.g. the same DNS or
+    timeout error for every request while a backend is down).
+    """
+    # Pick the highest-priority category mentioned anywhere in the message
+    best_category = None
+    best_rank = len(_ERROR_PRIORITY)
+    for match in _ERROR_CLASSIFIER.finditer(error_str):
+        category = match.lastgroup
+        rank = _ERROR_PRIORITY[category]
+        if rank < best_rank:
+            best_category, best_rank = category, rank
+            if rank == 0:
+                break
+    if best_category is None:
+        return None
+    return _ERROR_MESSAGES[best_category]
+
+
 def format_error_message(error: Exception, default_message: str = "An error occurred") -> str:
     """
     Format error message for user display.
@@ -33,34 +97,4 @@ def format_error_message(error: Exception, default_message: str = "An error occu
     if not error_str:
         return default_message
     
-    # Handle DNS/network resolution errors
-    if "nodename nor servname provided" in error_str or "not known" in error_str:
-        return (
-            "Network connection error: Unable to resolve server address. "
-            "This may be due to: 1) Network connectivity issues 2) DNS resolution problems "
-            "3) Firewall or proxy blocking the connection. "
-            "Please check your network connection and try again."
-        )
-    elif "Connection reset" in error_str or "Connection reset by peer" in error_str:
-        return (
-            "Connection was reset. This might be due to large file size or network instability. "
-            "Please try: 1) Upload smaller files 2) Check network connection 3) Retry later"
-        )
-    elif "timeout" in error_str.lower() or "timed out" in error_str.lower():
-        return (
-            "Request timeout: Processing took too long. "
-            "Please try uploading smaller files or upload in batches."
-        )
-    elif "Connection" in error_str or "connect" in error_str.lower():
-        return (
-            "Connection error: Unable to connect to AI service. "
-            "Please check network connection or retry later."
-        )
-    elif "Name or service not known" in error_str or "getaddrinfo failed" in error_str:
-        return (
-            "DNS resolution error: Unable to resolve the server address. "
-            "Please check your network connection and DNS settings."
-        )
-    
-    return error_str
-
+    return _classify_error(error_str) or error_str
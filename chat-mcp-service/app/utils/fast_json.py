@@ -0,0 +1,75 @@
+"""Fast JSON helpers backed by orjson, falling back to ujson and then the stdlib."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional, only used without orjson
+    ujson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception type regardless of the backend in use.
+JSONDecodeError = json.JSONDecodeError
+
+if orjson is not None:
+    loads = orjson.loads
+
+    def _options(sort_keys: bool, indent: bool) -> int:
+        # Non-str keys are stringified like the stdlib does
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> str:
+        """Serialize obj to a JSON str (non-ASCII is kept as-is), compact unless indent."""
+        return orjson.dumps(obj, option=_options(sort_keys, indent)).decode("utf-8")
+
+    def dumps_bytes(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes, compact unless indent."""
+        return orjson.dumps(obj, option=_options(sort_keys, indent))
+elif ujson is not None:
+    def loads(text: Any) -> Any:
+        """Deserialize JSON text, raising json.JSONDecodeError like the other backends."""
+        try:
+            return ujson.loads(text)
+        except ValueError as e:
+            raise JSONDecodeError(str(e), text if isinstance(text, str) else "", 0) from None
+
+    def dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> str:
+        """Serialize obj to a JSON str (non-ASCII is kept as-is), compact unless indent."""
+        return ujson.dumps(
+            obj,
+            ensure_ascii=False,
+            escape_forward_slashes=False,
+            sort_keys=sort_keys,
+            indent=2 if indent else 0,
+        )
+
+    def dumps_bytes(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes, compact unless indent."""
+        return dumps(obj, sort_keys=sort_keys, indent=indent).encode("utf-8")
+else:
+    loads = json.loads
+
+    def dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> str:
+        """Serialize obj to a JSON str (non-ASCII is kept as-is), compact unless indent."""
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+
+    def dumps_bytes(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes, compact unless indent."""
+        return dumps(obj, sort_keys=sort_keys, indent=indent).encode("utf-8")
+
+
+__all__ = ["JSONDecodeError", "dumps", "dumps_bytes", "loads"]
@@ -0,0 +1,107 @@
+"""Incremental completeness tracking for JSON streamed in fragments."""
+from __future__ import annotations
+
+_OPEN = frozenset("{[")
+_CLOSE = frozenset("}]")
+_WHITESPACE = frozenset(" \t\r\n")
+
+
+def _has_structural(fragment: str) -> bool:
+    """Check whether fragment contains a quote or bracket."""
+    return (
+        '"' in fragment
+        or "{" in fragment
+        or "}" in fragment
+        or "[" in fragment
+        or "]" in fragment
+    )
+
+
+class IncrementalJsonParser:
+    """
+    Track whether a JSON object/array streamed in fragments is complete.
+
+    Each fragment passed to feed() is scanned once, updating bracket depth and
+    string/escape state, so checking completeness after every delta costs
+    O(len(delta)) instead of re-parsing the whole accumulated buffer. This is a
+    structural check only; a balanced value is still parsed once for real when
+    it is used.
+    """
+
+    __slots__ = ("depth", "in_string", "escape", "started", "complete", "invalid")
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.started = False
+        self.complete = False
+        self.invalid = False
+
+    def feed(self, fragment: str) -> bool:
+        """Scan the next fragment and return whether the value is now complete."""
+        if self.invalid:
+            return False
+
+        # Most argument deltas are a piece of a string value or of a number/
+        # literal; if no character in them can change the state, the substring
+        # checks (done in C) let us skip the per-character loop entirely.
+        if self.in_string:
+            if not self.escape and '"' not in fragment and "\\" not in fragment:
+                return self.complete
+        elif self.started and not self.complete and not _has_structural(fragment):
+            return False
+
+        depth = self.depth
+        in_string = self.in_string
+        escape = self.escape
+        started = self.started
+        complete = self.complete
+
+        for char in fragment:
+            if complete:
+                if char not in _WHITESPACE:
+                    # Trailing data after the closing bracket
+                    self.invalid = True
+                    complete = False
+                    break
+            elif in_string:
+                if escape:
+                    escape = False
+                elif char == "\\":
+                    escape = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in _OPEN:
+                depth += 1
+                started = True
+            elif char in _CLOSE:
+                depth -= 1
+                if depth == 0:
+                    complete = True
+                elif depth < 0:
+                    self.invalid = True
+                    break
+            elif not started and char not in _WHITESPACE:
+                # Only objects and arrays are tracked
+                self.invalid = True
+                break
+
+        self.depth = depth
+        self.in_string = in_string
+        self.escape = escape
+        self.started = started
+        self.complete = complete and not self.invalid
+        return self.complete
+
+
+def is_balanced_json(text: str) -> bool:
+    """
+    Check in one scan whether text is a structurally complete JSON object/array.
+
+    Nothing is allocated for the parsed value, so this is a cheap gate before a
+    real parse of text that may still be streaming.
+    """
+    return IncrementalJsonParser().feed(text)
@@ -51,6 +51,9 @@ class MilvusClient:
         self.password = password
         self.alias = alias
         self._connected = False
+        # Collection handles by name; building one costs a has_collection and a
+        # describe-collection round trip, so each is looked up once
+        self._collections: Dict[str, Collection] = {}
 
     def connect(self) -> bool:
         """
@@ -78,6 +81,7 @@ class MilvusClient:
     def disconnect(self) -> None:
         """Disconnect from Milvus server."""
         try:
+            self._collections.clear()
             if self._connected:
                 connections.disconnect(alias=self.alias)
                 self._connected = False
@@ -145,7 +149,7 @@ class MilvusClient:
             schema = CollectionSchema(
                 fields=fields, description=description, auto_id=auto_id
             )
-            collection = Collection(
+            self._collections[collection_name] = Collection(
                 name=collection_name, schema=schema, using=self.alias
             )
             logger.info(f"Created collection '{collection_name}'")
@@ -233,17 +237,25 @@ class MilvusClient:
         """
         Get a collection object.
 
+        The handle is cached after the first lookup and dropped again by
+        drop_collection() and disconnect().
+
         Args:
             collection_name: Name of the collection
 
         Returns:
             Collection object if exists, None otherwise
         """
+        collection = self._collections.get(collection_name)
+        if collection is not None:
+            return collection
         try:
             if not self.collection_exists(collection_name):
                 logger.warning(f"Collection '{collection_name}' does not exist")
                 return None
-            return Collection(name=collection_name, using=self.alias)
+            collection = Collection(name=collection_name, using=self.alias)
+            self._collections[collection_name] = collection
+            return collection
         except Exception as e:
             logger.error(
                 f"Error getting collection '{collection_name}': {e}", exc_info=True
@@ -260,6 +272,8 @@ class MilvusClient:
         Returns:
             True if collection dropped successfully, False otherwise
         """
+        # Forget the handle even if the drop fails; it is re-fetched on next use
+        self._collections.pop(collection_name, None)
         try:
             if not self.collection_exists(collection_name):
                 logger.warning(f"Collection '{collection_name}' does not exist")
@@ -278,14 +292,19 @@ class MilvusClient:
         collection_name: str,
         data: List[List[Any]],
         field_names: Optional[List[str]] = None,
+        flush: bool = False,
     ) -> Optional[List[int]]:
         """
         Insert data into a collection.
 
+        Inserted data is searchable without a flush. Bulk loaders should call
+        flush() once at the end rather than flushing every insert.
+
         Args:
             collection_name: Name of the collection
             data: List of lists, where each inner list represents a row of data
             field_names: Optional list of field names in order (if None, uses schema order)
+            flush: Whether to flush (seal) the data right after inserting (default: False)
 
         Returns:
             List of inserted IDs if successful, None otherwise
@@ -297,7 +316,8 @@ class MilvusClient:
 
             # Insert data
             result = collection.insert(data, field_names=field_names)
-            collection.flush()  # Ensure data is written
+            if flush:
+                collection.flush()
             logger.info(f"Inserted {len(data)} entities into '{collection_name}'")
             return result.primary_keys
         except Exception as e:
@@ -416,6 +436,7 @@ class MilvusClient:
         self,
         collection_name: str,
         expr: str,
+        flush: bool = False,
     ) -> bool:
         """
         Delete entities from collection.
@@ -423,6 +444,7 @@ class MilvusClient:
         Args:
             collection_name: Name of the collection
             expr: Delete expression (e.g., "id in [1, 2, 3]" or 'text == "some text"')
+            flush: Whether to flush the deletion right away (default: False)
 
         Returns:
             True if deletion successful, False otherwise
@@ -440,19 +462,14 @@ class MilvusClient:
             else:
                 collection.load()
 
-            # Get count before deletion for logging
-            count_before = collection.num_entities
-
-            # Delete entities
-            collection.delete(expr)
-            collection.flush()
-
-            # Get count after deletion
-            count_after = collection.num_entities
-            deleted_count = count_before - count_after
+            # Delete entities (num_entities only changes after a flush, so the
+            # count comes from the mutation result)
+            result = collection.delete(expr)
+            if flush:
+                collection.flush()
 
             logger.info(
-                f"Deleted {deleted_count} entities from '{collection_name}' with expression: {expr}"
+                f"Deleted {result.delete_count} entities from '{collection_name}' with expression: {expr}"
             )
             return True
         except Exception as e:
@@ -461,6 +478,30 @@ class MilvusClient:
             )
             return False
 
+    def flush(self, collection_name: str) -> bool:
+        """
+        Flush a collection, sealing its pending inserts and deletes.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            True if flushed successfully, False otherwise
+        """
+        try:
+            collection = self.get_collection(collection_name)
+            if collection is None:
+                return False
+
+            collection.flush()
+            logger.info(f"Flushed collection '{collection_name}'")
+            return True
+        except Exception as e:
+            logger.error(
+                f"Error flushing collection '{collection_name}': {e}", exc_info=True
+            )
+            return False
+
     def create_index(
         self,
         collection_name: str,
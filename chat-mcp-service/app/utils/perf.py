@@ -0,0 +1,47 @@
+"""Lightweight timing helpers for [PERF] logging."""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Any, Optional
+
+# [PERF] timing is opt-in so production requests skip the clock reads and log
+# formatting entirely; set CHAT_PERF=1 to enable it.
+PERF_ENABLED = os.getenv("CHAT_PERF", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def is_perf_enabled(logger: logging.Logger) -> bool:
+    """Whether [PERF] timings should be measured and logged for this logger."""
+    return PERF_ENABLED and logger.isEnabledFor(logging.INFO)
+
+
+class PerfTimer:
+    """
+    Context manager that logs the elapsed time of a block as a [PERF] line.
+
+    The label may contain %-style placeholders filled from args. When [PERF]
+    logging is disabled the timer is a no-op: no clock is read and no message
+    is formatted.
+    """
+
+    __slots__ = ("_logger", "_label", "_args", "_start", "elapsed")
+
+    def __init__(self, logger: logging.Logger, label: str, *args: Any):
+        self._logger = logger
+        self._label = label
+        self._args = args
+        self._start: Optional[int] = None
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "PerfTimer":
+        if is_perf_enabled(self._logger):
+            self._start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._start is not None:
+            self.elapsed = (time.monotonic_ns() - self._start) / 1e9
+            self._logger.info(
+                "[PERF] " + self._label + " took %.3fs", *self._args, self.elapsed
+            )
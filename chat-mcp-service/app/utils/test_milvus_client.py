@@ -188,6 +188,7 @@ class MilvusClientTest:
                 collection_name=self.test_collection_name,
                 data=data,
                 field_names=field_names,
+                flush=True,  # num_entities is checked right after
             )
 
             if result:
@@ -332,6 +333,7 @@ class MilvusClientTest:
             result = self.client.delete(
                 collection_name=self.test_collection_name,
                 expr=f'id == {entity_id}',
+                flush=True,  # num_entities is compared right after
             )
 
             if result:
@@ -0,0 +1,26 @@
+"""Tests for DocumentChunker."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent.resolve()
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.utils.document_processor import DocumentChunker
+
+
+def test_char_count_chunk_offsets_cover_chunk_text():
+    content = "# Kyoto\n\nIntro line.\n\n" + "temple " * 150
+    chunker = DocumentChunker(chunk_size=100, chunk_overlap=10, min_chunk_size=20)
+
+    chunks = [
+        chunk for chunk in chunker.chunk_markdown(content)
+        if chunk.metadata["strategy"] == "char_count"
+    ]
+
+    assert chunks
+    for chunk in chunks:
+        assert content[chunk.start_pos:chunk.end_pos] == chunk.text
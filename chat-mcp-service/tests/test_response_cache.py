@@ -0,0 +1,22 @@
+"""Tests for ResponseCache."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent.resolve()
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.service.response_cache import ResponseCache
+
+
+def test_key_depends_on_model():
+    cache = ResponseCache()
+    messages = [{"role": "user", "content": "Best time to visit Kyoto?"}]
+    key = cache.make_key("prompt", messages, "OpenAIClient:gpt-4o")
+    cache.put(key, "Spring or autumn.")
+
+    assert cache.get(cache.make_key("prompt", messages, "OpenAIClient:gpt-4o")) == "Spring or autumn."
+    assert cache.get(cache.make_key("prompt", messages, "QwenClient:qwen-plus")) is None
@@ -0,0 +1,70 @@
+"""Tests for StreamBuffer."""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from contextlib import aclosing
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent.resolve()
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.service.stream_buffer import StreamBuffer
+
+
+async def _deltas(pause: float):
+    """Yield three deltas, pausing after the second one."""
+    yield "a"
+    yield "b"
+    await asyncio.sleep(pause)
+    yield "c"
+
+
+@pytest.mark.asyncio
+async def test_buffered_text_is_flushed_while_upstream_pauses():
+    buffer = StreamBuffer(flush_interval=0.01)
+    emitted = []
+    start = time.monotonic()
+
+    async with aclosing(buffer.paced(_deltas(pause=0.3))) as paced:
+        async for delta in paced:
+            text = buffer.flush() if delta is None else buffer.push(delta)
+            if text:
+                emitted.append((text, time.monotonic() - start))
+    text = buffer.flush()
+    if text:
+        emitted.append((text, time.monotonic() - start))
+
+    assert [text for text, _ in emitted] == ["a", "b", "c"]
+    # "b" is delivered within the flush interval, not when "c" arrives
+    assert emitted[1][1] < 0.2
+
+
+@pytest.mark.asyncio
+async def test_closing_early_ends_the_pending_read():
+    buffer = StreamBuffer(flush_interval=0.01)
+    closed = asyncio.Event()
+
+    async def upstream():
+        try:
+            yield "a"
+            yield "b"
+            await asyncio.sleep(10)
+            yield "c"
+        finally:
+            closed.set()
+
+    stream = upstream()
+    async with aclosing(stream), aclosing(buffer.paced(stream)) as paced:
+        async for delta in paced:
+            if delta is None:
+                break
+            buffer.push(delta)
+
+    assert closed.is_set()
+    assert buffer.flush() == "b"
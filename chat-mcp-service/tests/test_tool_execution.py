@@ -0,0 +1,116 @@
+"""Tests for ToolExecutionService."""
+from __future__ import annotations
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent.resolve()
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.mcp_tools import ToolResult
+from app.service.tool_execution import ToolExecutionService
+from app.service.tool_result_formatter import format_tool_result_for_llm
+from app.service.tool_result_store import GET_TOOL_RESULT_TOOL_NAME, ToolResultStore
+from app.utils import fast_json
+
+
+class FakeRegistry:
+    """Registry returning canned results per tool name."""
+
+    def __init__(self, results):
+        self.results = results
+        self.arguments = {}
+
+    async def call_tool_with_result(self, tool_call):
+        self.arguments[tool_call.id] = tool_call.arguments
+        return ToolResult(
+            tool_name=tool_call.name, success=True, result=self.results[tool_call.name]
+        )
+
+
+def _tool_call(call_id: str, name: str, arguments: str = "{}") -> dict:
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": arguments}}
+
+
+async def _run(executor, tool_calls, result_store):
+    """Execute tool calls, returning the events and the conversation messages."""
+    messages = []
+    events = [
+        event
+        async for event in executor.execute_tool_calls(tool_calls, "", messages, result_store)
+    ]
+    return events, messages
+
+
+@pytest.mark.asyncio
+async def test_parallel_unformattable_result_is_isolated():
+    registry = FakeRegistry({
+        "good": {"answer": "ok"},
+        # orjson cannot serialize Decimal, so formatting this result raises
+        "bad": {"price": Decimal("1.5")},
+    })
+    executor = ToolExecutionService(registry, format_tool_result_for_llm)
+    tool_calls = [_tool_call("call_good", "good"), _tool_call("call_bad", "bad")]
+
+    events, messages = await _run(executor, tool_calls, ToolResultStore())
+
+    by_type = {(e["type"], e["tool_call_id"]) for e in events}
+    assert ("tool_call_end", "call_good") in by_type
+    assert ("tool_call_error", "call_bad") in by_type
+
+    # Assistant message, then one tool message per call in tool_calls order
+    assert messages[0]["role"] == "assistant"
+    tool_messages = messages[1:]
+    assert [m["tool_call_id"] for m in tool_messages] == ["call_good", "call_bad"]
+    assert "ok" in tool_messages[0]["content"]
+    assert tool_messages[1]["content"].startswith("Error: ")
+
+
+@pytest.mark.asyncio
+async def test_stored_results_are_not_shared_between_requests():
+    registry = FakeRegistry({"search": "x" * 100})
+    executor = ToolExecutionService(registry, format_tool_result_for_llm)
+    first_request = ToolResultStore(max_inline_chars=10)
+    other_request = ToolResultStore(max_inline_chars=10)
+
+    _, messages = await _run(executor, [_tool_call("call_1", "search")], first_request)
+    # The newest result goes to the LLM whole; it is stored once re-sent later
+    assert messages[-1]["content"] == "x" * 100
+    first_request.compact_messages(messages)
+    assert GET_TOOL_RESULT_TOOL_NAME in messages[-1]["content"]
+
+    read_call = _tool_call(
+        "call_2", GET_TOOL_RESULT_TOOL_NAME, '{"tool_call_id": "call_1", "offset": 10}'
+    )
+    _, same = await _run(executor, [read_call], first_request)
+    _, other = await _run(executor, [read_call], other_request)
+    assert same[-1]["content"].startswith("x" * 10)
+    assert "x" not in other[-1]["content"]
+
+
+
+@pytest.mark.asyncio
+async def test_parsed_args_are_used_without_reparsing(monkeypatch):
+    def fail_loads(text):
+        raise AssertionError("arguments were parsed again")
+
+    monkeypatch.setattr(fast_json, "loads", fail_loads)
+    registry = FakeRegistry({"search": "ok"})
+    executor = ToolExecutionService(registry, format_tool_result_for_llm)
+    args = {"query": "Kyoto"}
+    tool_call = _tool_call("call_1", "search", '{"query":"Kyoto"}')
+
+    events = [
+        event
+        async for event in executor.execute_tool_calls(
+            [tool_call], "", [], ToolResultStore(), {"call_1": args}
+        )
+    ]
+
+    assert events[0]["input"] == args
+    assert registry.arguments["call_1"] == args
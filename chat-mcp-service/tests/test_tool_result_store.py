@@ -0,0 +1,42 @@
+"""Tests for ToolResultStore."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent.resolve()
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.service.tool_result_store import GET_TOOL_RESULT_TOOL_NAME, ToolResultStore
+
+
+def _tool_message(call_id: str, name: str, content: str) -> dict:
+    return {"role": "tool", "tool_call_id": call_id, "name": name, "content": content}
+
+
+def test_compact_messages_only_shortens_messages_from_start():
+    store = ToolResultStore(max_inline_chars=10)
+    already_compacted = _tool_message("call_1", "search", "a" * 50)
+    earlier = _tool_message("call_2", "search", "b" * 50)
+    messages = [{"role": "user", "content": "hi"}, already_compacted, earlier]
+
+    assert not store
+    store.compact_messages(messages, 2)
+
+    assert already_compacted["content"] == "a" * 50
+    assert earlier["content"].startswith("b" * 10)
+    assert 'tool_call_id="call_2", offset=10' in earlier["content"]
+    assert store.read("call_2", 10).startswith("b" * 10)
+    assert len(store) == 1
+
+
+def test_compact_messages_keeps_pages_of_stored_results():
+    store = ToolResultStore(max_inline_chars=10)
+    page = _tool_message("call_3", GET_TOOL_RESULT_TOOL_NAME, "c" * 50)
+
+    store.compact_messages([page])
+
+    assert page["content"] == "c" * 50
+    assert not store